@@ -12,15 +12,27 @@ bl_info = {
 
 import bpy
 
+from . import material_override
+from . import output_formats
 from . import automated_parts_renderer
 from . import image_selector
+from . import render_queue
+from . import batch_render
 
 def register():
+    material_override.register()
+    output_formats.register()
     automated_parts_renderer.register()
     image_selector.register()
+    render_queue.register()
+    batch_render.register()
 
 def unregister():
+    batch_render.unregister()
+    render_queue.unregister()
     automated_parts_renderer.unregister()
+    output_formats.unregister()
+    material_override.unregister()
     image_selector.unregister()
 
 if __name__ == "__main__":
@@ -11,73 +11,212 @@ bl_info = {
 }
 
 
+import hashlib
+import json
 import math
 import os
 import bpy
-from mathutils import Vector
+from mathutils import Matrix, Vector
+import numpy as np
 import re
+import time
+
+from .framing_cache import FramingCache
+from .image_compare import INCREMENTAL_DIRECTORY_NAME, publish_image, write_changed_files
+from .material_override import MaterialOverrideRule, apply_material_override, draw_material_override_settings, restore_materials
+from .media_uploader import MediaUploader, UploadState, upload_files
+from .media_workbook import read_work_list
+from .mesh_statistics import MeshStatisticsCache
+from .output_formats import OutputFormat, draw_output_format_settings, save_extra_formats
+from .progress_events import open_event_stream
+from .render_manifest import RenderManifest, get_shard_name
+from .render_profiler import RenderProfiler
+from .scene_snapshot import SceneSnapshot, use_render_compositor
+
+
+# The bpy.data collections of the datablock types that renderer settings point to
+DATABLOCK_COLLECTIONS = {"Material": "materials"}
+
+# Result of the last render run, read by callers of the operator like the render queue worker
+last_run_summary = {}
+
+
+def is_collection_instance(obj):
+    return obj.instance_type == 'COLLECTION' and obj.instance_collection is not None
+
+
+# Collect the meshes a collection instance renders as, with their matrices relative to the instancer
+def get_instanced_meshes(collection, matrix=None, depth=0):
+    if matrix is None:
+        matrix = Matrix.Identity(4)
+    offset = Matrix.Translation(-collection.instance_offset)
+
+    meshes = []
+    for child in collection.all_objects:
+        child_matrix = matrix @ offset @ child.matrix_world
+        if child.type == 'MESH':
+            meshes.append((child, child_matrix))
+        elif is_collection_instance(child) and depth < 16:
+            meshes += get_instanced_meshes(child.instance_collection, child_matrix, depth + 1)
+    return meshes
+
+
+# Collect the collection instances nested inside a collection, which have to render for its meshes to show
+def get_nested_instancers(collection, depth=0):
+    instancers = []
+    for child in collection.all_objects:
+        if is_collection_instance(child) and depth < 16:
+            instancers.append(child)
+            instancers += get_nested_instancers(child.instance_collection, depth + 1)
+    return instancers
+
+
+# Get the bounding box center in object space and the largest world space dimension of an object.
+# Mesh bounds come from the mesh statistics unless modifiers change the evaluated geometry.
+def get_object_bounds(obj, mesh_statistics=None):
+    if not is_collection_instance(obj):
+        if mesh_statistics is None or obj.type != 'MESH' or obj.modifiers:
+            return 0.125 * sum((Vector(b) for b in obj.bound_box), Vector()), max(obj.dimensions)
+        statistics = mesh_statistics.get(obj.data)
+        dimensions = statistics.dimensions * np.abs(np.array(obj.matrix_world.to_scale()))
+        return Vector(statistics.bounds_center), float(dimensions.max())
+
+    corners = []
+    for child, matrix in get_instanced_meshes(obj.instance_collection):
+        if mesh_statistics is None or child.modifiers:
+            child_corners = np.array([tuple(b) for b in child.bound_box])
+        else:
+            child_corners = mesh_statistics.get(child.data).corners
+        corners.append(child_corners @ np.array(matrix.to_3x3()).T + np.array(matrix.translation))
+    if not corners:
+        return Vector(), 0.0
 
-# Focus camera on object based on zoom factor
-def focus_camera_on_object(obj, camera, zoom_factor):
-    max_dim = max(obj.dimensions)
-    distance = max_dim / (2.0 * (3.14159 / 180.0) * camera.data.angle)
+    corners = np.concatenate(corners)
+    bbox_min = corners.min(axis=0)
+    bbox_max = corners.max(axis=0)
+    dimensions = (bbox_max - bbox_min) * np.array(obj.matrix_world.to_scale())
+    return Vector(0.5 * (bbox_min + bbox_max)), float(np.abs(dimensions).max())
 
-    distance *= zoom_factor
 
-    bbox_center = 0.125 * sum((Vector(b) for b in obj.bound_box), Vector())
+# The name images of an object are saved under; collection instances are named after their collection
+def get_render_name(obj):
+    if is_collection_instance(obj):
+        return obj.instance_collection.name
+    return obj.name
+
+
+# Focus camera on object based on zoom factor, reusing cached framing of identical geometry
+def focus_camera_on_object(obj, camera, zoom_factor, framing_cache=None, view="", mesh_statistics=None):
+    bbox_center, max_dim = get_object_bounds(obj, mesh_statistics)
     global_center = obj.matrix_world @ bbox_center
 
     direction = camera.location - global_center
     direction.normalize()
+
+    key = None
+    if framing_cache is not None:
+        instanced_meshes = get_instanced_meshes(obj.instance_collection) if is_collection_instance(obj) else None
+        key = framing_cache.get_key(obj, view, zoom_factor, camera.data.angle, instanced_meshes)
+        framing = framing_cache.get(key) if key is not None else None
+        if framing:
+            camera.location = global_center + Vector(framing["offset"])
+            camera.rotation_euler = framing["rotation"]
+            return
+
+    distance = max_dim / (2.0 * (3.14159 / 180.0) * camera.data.angle)
+
+    distance *= zoom_factor
+
+    # Point the camera's -Z axis at the object with Y up, like a Track To constraint
     camera.location = global_center + distance * direction
-    camera.rotation_euler = (0.0, 0.0, 0.0)
-    bpy.context.view_layer.update()
+    camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
 
-    constraint = camera.constraints.new(type='TRACK_TO')
-    constraint.target = obj
-    constraint.track_axis = 'TRACK_NEGATIVE_Z'
-    constraint.up_axis = 'UP_Y'
+    if key is not None:
+        framing_cache.set(key, camera.location - global_center, camera.rotation_euler)
 
 
 # The main rendering function
-def render_images(obj, camera_obj, render_settings, views, progress_info):
+def render_images(obj, camera_obj, render_settings, views, progress_info, output_info):
     original_rotation = obj.rotation_euler.copy()
 
     # Render from selected views
     if (views["isometric"]):
         camera_obj.location = (74.82, -65.07, 53.43)
-        focus_camera_on_object(obj, camera_obj, render_settings.zoom_factor)
-        views["current_view"] = "iso"
-        render_images_from_current_view(render_settings, obj, progress_info, views)
+        render_images_from_view(obj, camera_obj, render_settings, views, progress_info, output_info, "iso")
     if (views["side_view"]):
         camera_obj.location = (obj.location.x + 100, obj.location.y, obj.location.z)
-        focus_camera_on_object(obj, camera_obj, render_settings.zoom_factor)
-        views["current_view"] = "side"
-        render_images_from_current_view(render_settings, obj, progress_info, views)
+        render_images_from_view(obj, camera_obj, render_settings, views, progress_info, output_info, "side")
     if (views["top_view"]):
         camera_obj.location = (obj.location.x, obj.location.y, obj.location.z + 100)
-        focus_camera_on_object(obj, camera_obj, render_settings.zoom_factor)
-        views["current_view"] = "top"
-        render_images_from_current_view(render_settings, obj, progress_info, views)
+        render_images_from_view(obj, camera_obj, render_settings, views, progress_info, output_info, "top")
     
     # Restore original object rotation
     obj.rotation_euler = original_rotation
 
 
+# Frame the object from the camera position and render all rotation steps
+def render_images_from_view(obj, camera_obj, render_settings, views, progress_info, output_info, view):
+    start_time = time.perf_counter()
+    focus_camera_on_object(obj, camera_obj, render_settings.zoom_factor, output_info["framing_cache"], view,
+                           output_info["mesh_statistics"])
+    progress_info["phase_timings"]["framing"] += time.perf_counter() - start_time
+
+    views["current_view"] = view
+    render_images_from_current_view(render_settings, obj, progress_info, views, output_info)
+
+
 # Perform rotations and render for each angle
-def render_images_from_current_view(render_settings, obj, progress_info, views):
+def render_images_from_current_view(render_settings, obj, progress_info, views, output_info):
     scene = bpy.context.scene
-    output_dir = bpy.path.abspath(render_settings.output_directory)
+    render_name = get_render_name(obj)
+    shard_name = get_shard_name(render_name, render_settings.output_layout, render_settings.shard_length)
+    output_dir = os.path.join(output_info["directory"], shard_name)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
-    file_name = obj.name + views["current_view"] + "_{step}"
+    file_name = render_name + views["current_view"] + "_{step}"
 
     for step in range(render_settings.rotation_steps):
         obj.rotation_euler.z += 2 * math.pi / render_settings.rotation_steps
-        scene.render.filepath = os.path.join(output_dir, file_name.format(step=step))
+        image_name = file_name.format(step=step)
+        image_path = os.path.join(output_dir, image_name) + scene.render.file_extension
+
+        # Incremental output renders into a temporary directory and only replaces images that changed
+        if render_settings.incremental_output:
+            scene.render.filepath = os.path.join(output_info["incremental_directory"], image_name)
+        else:
+            scene.render.filepath = os.path.join(output_dir, image_name)
         
         # Render image
+        start_time = time.perf_counter()
         bpy.ops.render.render(write_still=True)
+        render_end_time = time.perf_counter()
+        progress_info["phase_timings"]["render"] += render_end_time - start_time
+
+        changed = True
+        if render_settings.incremental_output:
+            changed = publish_image(scene.render.filepath + scene.render.file_extension, image_path, render_settings.min_similarity)
+            if changed:
+                output_info["changed_files"].append(image_path)
+
+        extra_paths, written_paths = save_extra_formats(scene, render_settings, output_info["directory"], shard_name,
+                                                        image_name, skip_existing=not changed)
+        image_paths = [image_path] + extra_paths
+        if render_settings.incremental_output:
+            output_info["changed_files"] += written_paths
+        progress_info["events"].emit("image_written", object=render_name, view=views["current_view"], step=step,
+                                     path=image_path, changed=changed, duration=time.perf_counter() - start_time)
+
+        # Index the written images
+        checksums = {}
+        if output_info["manifest"]:
+            for path in image_paths:
+                checksums[path] = output_info["manifest"].add_image(path, render_name, views["current_view"], step,
+                                                                    output_info["settings_hash"])
+            output_info["manifest"].commit()
+        if output_info["uploads"] is not None:
+            output_info["uploads"] += [(path, checksums.get(path)) for path in image_paths]
+
+        progress_info["phase_timings"]["output"] += time.perf_counter() - render_end_time
 
         # Update the progress bar
         progress_info["current_image_number"] += 1
@@ -88,54 +227,8 @@ def render_images_from_current_view(render_settings, obj, progress_info, views):
         print(f"Rendering progress: {percentage:.2f}%")
 
 
-# Restore the world material
-def restore_original_node_tree(world, original_node_tree):
-    if not original_node_tree:
-        return
-
-    world.node_tree.nodes.clear()
-
-    # Reconstruct the original node tree
-    for original_node in original_node_tree.nodes:
-        node = world.node_tree.nodes.new(original_node.bl_idname)
-        node.location = original_node.location
-
-        for i, input_socket in enumerate(original_node.inputs):
-            if hasattr(input_socket, "default_value"):
-                if isinstance(input_socket.default_value, float):
-                    node.inputs[i].default_value = input_socket.default_value
-                else:
-                    node.inputs[i].default_value = input_socket.default_value[:]
-
-        if original_node.bl_idname == "ShaderNodeTexEnvironment":
-            node.image = original_node.image
-
-    # Reconnect nodes
-    for original_node in original_node_tree.nodes:
-        node = world.node_tree.nodes[original_node.name]
-
-        for output_socket in original_node.outputs:
-            for original_link in output_socket.links:
-                from_socket = node.outputs[original_link.from_socket.name]
-                to_socket = world.node_tree.nodes[original_link.to_node.name].inputs[original_link.to_socket.name]
-                world.node_tree.links.new(from_socket, to_socket)
-
-
-# Apply white render background
-def setup_white_background_compositor():
-    scene = bpy.context.scene
-    scene.use_nodes = True
-    tree = scene.node_tree
-
-    # Clear existing nodes
-    for node in tree.nodes:
-        tree.nodes.remove(node)
-
-    # Set color management to Raw for pure white background
-    scene.view_settings.view_transform = 'Standard'
-    scene.view_settings.look = 'None'
-
-    # Create nodes for white background compositor
+# Add compositor nodes that put the render on a white background
+def build_white_background_compositor(tree):
     render_layers_node = tree.nodes.new('CompositorNodeRLayers')
     render_layers_node.location = 0, 300
 
@@ -150,19 +243,11 @@ def setup_white_background_compositor():
     # Connect nodes
     tree.links.new(render_layers_node.outputs[0], alpha_over_node.inputs[2])
     tree.links.new(alpha_over_node.outputs[0], composite_node.inputs[0])
+    return composite_node
 
 
-# Apply transparent render background
-def setup_transparent_background_compositor():
-    scene = bpy.context.scene
-    scene.use_nodes = True
-    tree = scene.node_tree
-
-    # Clear existing nodes
-    for node in tree.nodes:
-        tree.nodes.remove(node)
-
-    # Create nodes for transparent background compositor
+# Add compositor nodes that keep the transparent render background
+def build_transparent_background_compositor(tree):
     render_layers_node = tree.nodes.new('CompositorNodeRLayers')
     render_layers_node.location = 0, 300
 
@@ -171,6 +256,7 @@ def setup_transparent_background_compositor():
 
     # Connect nodes
     tree.links.new(render_layers_node.outputs[0], composite_node.inputs[0])
+    return composite_node
 
 
 def strip_number_suffix(name):
@@ -183,6 +269,123 @@ def strip_number_suffix(name):
     return stripped_name
 
 
+# Get the renderer settings as a plain dictionary. Datablocks like override materials are stored by name
+# and collections like the material rules as lists of dictionaries.
+def settings_to_dict(render_settings):
+    settings = {}
+    for prop in render_settings.bl_rna.properties:
+        if prop.identifier == "rna_type":
+            continue
+        value = getattr(render_settings, prop.identifier)
+        if prop.type == 'POINTER':
+            value = value.name if value is not None else None
+        elif prop.type == 'COLLECTION':
+            value = [settings_to_dict(item) for item in value]
+        settings[prop.identifier] = value
+    return settings
+
+
+# Apply settings written by settings_to_dict. Datablocks are looked up by name and appended from
+# library_file, the .blend file the settings were taken from, when the open file does not have them.
+def apply_settings_dict(render_settings, settings, library_file=None):
+    for prop in render_settings.bl_rna.properties:
+        if prop.identifier not in settings:
+            continue
+        value = settings[prop.identifier]
+        if prop.type == 'POINTER':
+            value = load_datablock(prop.fixed_type, value, library_file) if value is not None else None
+        elif prop.type == 'COLLECTION':
+            items = getattr(render_settings, prop.identifier)
+            items.clear()
+            for item_settings in value:
+                apply_settings_dict(items.add(), item_settings, library_file)
+            continue
+        setattr(render_settings, prop.identifier, value)
+
+
+def load_datablock(datablock_type, name, library_file=None):
+    collection_name = DATABLOCK_COLLECTIONS[datablock_type.identifier]
+    datablocks = getattr(bpy.data, collection_name)
+    if name not in datablocks and library_file:
+        with bpy.data.libraries.load(library_file, link=False) as (data_from, data_to):
+            if name in getattr(data_from, collection_name):
+                setattr(data_to, collection_name, [name])
+    if name not in datablocks:
+        raise LookupError(f"{datablock_type.identifier} {name} not found")
+    return datablocks[name]
+
+
+# Hash of the settings that identifies which configuration an image was rendered with
+def get_settings_hash(render_settings):
+    settings_json = json.dumps(settings_to_dict(render_settings), sort_keys=True, default=str)
+    return hashlib.sha1(settings_json.encode("utf-8")).hexdigest()
+
+
+# Create the list of objects to be rendered and filter duplicate objects.
+# Collection instances are always rendered once per instanced collection.
+def get_render_objects(objects, duplicate_filter, mesh_statistics=None):
+    names_set = set()
+    unique_meshes = set()
+    unique_geometry = set()
+    unique_collections = set()
+    render_objects = []
+    for obj in objects:
+        if is_collection_instance(obj):
+            if obj.instance_collection not in unique_collections:
+                unique_collections.add(obj.instance_collection)
+                render_objects.append(obj)
+        elif obj.type == 'MESH':
+            if (duplicate_filter == "NAME_SUFFIX"):
+                stripped_name = strip_number_suffix(obj.name)
+                if stripped_name not in names_set:
+                    names_set.add(stripped_name)
+                    render_objects.append(obj)
+            elif (duplicate_filter == "MESH_DATA"):
+                if obj.data not in unique_meshes:
+                    unique_meshes.add(obj.data)
+                    render_objects.append(obj)
+            elif (duplicate_filter == "NAME_SUFFIX_+_MESH_DATA"):
+                stripped_name = strip_number_suffix(obj.name)
+                if stripped_name not in names_set and obj.data not in unique_meshes:
+                    names_set.add(stripped_name)
+                    unique_meshes.add(obj.data)
+                    render_objects.append(obj)
+            elif (duplicate_filter == "GEOMETRY"):
+                if mesh_statistics is None:
+                    mesh_statistics = MeshStatisticsCache()
+                fingerprint = mesh_statistics.get(obj.data).fingerprint
+                if fingerprint not in unique_geometry:
+                    unique_geometry.add(fingerprint)
+                    render_objects.append(obj)
+            else:
+                render_objects.append(obj)
+
+    return render_objects
+
+
+# Keep the objects whose SKU is in the work list and whose main product image does not exist yet.
+# Returns the kept objects and the reason each other object was skipped.
+def filter_work_list_objects(render_objects, work_list, render_settings):
+    output_directory = bpy.path.abspath(render_settings.output_directory)
+    kept_objects = []
+    skipped = {}
+    for obj in render_objects:
+        sku = strip_number_suffix(get_render_name(obj))
+        if sku not in work_list:
+            skipped[obj] = "not_in_work_list"
+            continue
+
+        main_file = work_list[sku]
+        if main_file:
+            shard_name = get_shard_name(sku, render_settings.output_layout, render_settings.shard_length)
+            if (os.path.exists(os.path.join(output_directory, main_file)) or
+                    os.path.exists(os.path.join(output_directory, shard_name, main_file))):
+                skipped[obj] = "image_exists"
+                continue
+        kept_objects.append(obj)
+    return kept_objects, skipped
+
+
 # An operator for rendering images
 class RENDER_OT_automated_object_renderer(bpy.types.Operator):
     bl_idname = "render.automated_object_renderer"
@@ -194,28 +397,39 @@ class RENDER_OT_automated_object_renderer(bpy.types.Operator):
         
         # Import settings from GUI
         render_settings = scene.automated_object_renderer
+        last_run_summary.clear()
+
+        # Read the work list before changing anything in the scene
+        work_list = None
+        if render_settings.work_list_file:
+            try:
+                work_list = read_work_list(bpy.path.abspath(render_settings.work_list_file))
+            except (OSError, KeyError, ValueError) as e:
+                self.report({'ERROR'}, f"Could not read the work list: {e}")
+                return {'CANCELLED'}
         
-        # Store original assets
-        original_camera = scene.camera
-        original_film_transparent = scene.render.film_transparent
-        world = scene.world
-        original_use_nodes = world.use_nodes
-        if world.node_tree:
-            original_node_tree = world.node_tree.copy()
-        else:
-            original_node_tree = None
+        # Every scene setting the run changes is recorded in the snapshot and restored when the run ends,
+        # also when rendering fails
+        with SceneSnapshot() as snapshot:
+            return self.run(context, render_settings, work_list, snapshot)
+
+    def run(self, context, render_settings, work_list, snapshot):
+        scene = context.scene
 
         # Create a temporary camera
         camera = bpy.data.cameras.new("TempCamera")
         camera_obj = bpy.data.objects.new("TempCamera", camera)
         bpy.context.collection.objects.link(camera_obj)
-        scene.camera = camera_obj
 
-        # Store original render settings
-        original_output_path = scene.render.filepath
-        original_resolution_x = scene.render.resolution_x
-        original_resolution_y = scene.render.resolution_y
-        original_percentage = scene.render.resolution_percentage
+        def remove_camera():
+            bpy.data.objects.remove(camera_obj)
+            bpy.data.cameras.remove(camera)
+
+        snapshot.on_restore(remove_camera)
+        snapshot.set(scene, "camera", camera_obj)
+
+        # Rendering changes the output path for every image
+        snapshot.set(scene.render, "filepath", scene.render.filepath)
 
         # Store information about selected views
         views = {}
@@ -225,111 +439,184 @@ class RENDER_OT_automated_object_renderer(bpy.types.Operator):
         views["current_view"] = ""
         
         # Create the list of objects to be rendered
-        duplicate_filter = render_settings.duplicate_filter
-        render_objects = [] 
-
-        # Filter duplicate objects
-        names_set = set()
-        unique_meshes = []
-        render_objects = []
-        for obj in bpy.context.selected_objects:
-            if obj.type == 'MESH':
-                if (duplicate_filter == "NAME_SUFFIX"):
-                    stripped_name = strip_number_suffix(obj.name)
-                    if stripped_name not in names_set:
-                        names_set.add(stripped_name)
-                        render_objects.append(obj)
-                elif (duplicate_filter == "MESH_DATA"):
-                    if obj.data not in unique_meshes:
-                        unique_meshes.append(obj.data)
-                        render_objects.append(obj)
-                elif (duplicate_filter == "NAME_SUFFIX_+_MESH_DATA"):
-                    stripped_name = strip_number_suffix(obj.name)
-                    if stripped_name not in names_set and obj.data not in unique_meshes:
-                        names_set.add(stripped_name)
-                        unique_meshes.append(obj.data)
-                        render_objects.append(obj)
-                else:
-                    render_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+        mesh_statistics = MeshStatisticsCache()
+        render_objects = get_render_objects(context.selected_objects, render_settings.duplicate_filter, mesh_statistics)
+
+        # Only render the SKUs of the work list that are still missing their main image
+        work_list_skipped = {}
+        if work_list is not None:
+            render_objects, work_list_skipped = filter_work_list_objects(render_objects, work_list, render_settings)
 
         # Progress bar setup
         progress_info = {}
         progress_info["wm"] = context.window_manager
         progress_info["total_image_quantity"] = len(render_objects) * render_settings.rotation_steps * sum([views["isometric"], views["side_view"], views["top_view"]])
         progress_info["current_image_number"] = 0
+        progress_info["start_time"] = time.perf_counter()
+        progress_info["phase_timings"] = {"setup": 0.0, "framing": 0.0, "render": 0.0, "output": 0.0, "upload": 0.0,
+                                          "restore": 0.0}
         
         progress_info["wm"].progress_begin(0, progress_info["total_image_quantity"])
-
-        # Store original nodes and configure compositor
-        original_use_scene_nodes = scene.use_nodes
-
-        # Store the original color management settings
-        original_view_transform = scene.view_settings.view_transform
-        original_look = scene.view_settings.look
-
-        scene.render.film_transparent = True
+        snapshot.on_restore(progress_info["wm"].progress_end)
+
+        # Progress events for external monitoring
+        event_target = render_settings.event_target
+        if event_target and "://" not in event_target:
+            event_target = bpy.path.abspath(event_target)
+        progress_info["events"] = open_event_stream(event_target, render_settings.event_interval)
+        progress_info["events"].emit("run_started", blend_file=bpy.data.filepath, part_count=len(render_objects),
+                                     total_images=progress_info["total_image_quantity"])
+        rendered_objects = set(render_objects)
+        for obj in context.selected_objects:
+            if obj not in rendered_objects:
+                progress_info["events"].emit("part_skipped", object=obj.name, reason=work_list_skipped.get(obj, "filtered"))
+
+        # Configure the compositor and color management
+        snapshot.set(scene.render, "film_transparent", True)
         if render_settings.background_option == "WHITE":
-            setup_white_background_compositor()
+            # Standard view transform for a pure white background
+            snapshot.set(scene.view_settings, "view_transform", 'Standard')
+            snapshot.set(scene.view_settings, "look", 'None')
+            use_render_compositor(snapshot, scene, build_white_background_compositor)
 
         elif render_settings.background_option == "TRANSPARENT":
-            setup_transparent_background_compositor()
+            use_render_compositor(snapshot, scene, build_transparent_background_compositor)
 
         # Set render settings
-        scene.render.image_settings.file_format = render_settings.file_format
-        scene.render.resolution_x = render_settings.resolution_x
-        scene.render.resolution_y = render_settings.resolution_y
-        scene.render.resolution_percentage = render_settings.resolution_percentage
+        # Changing the file format can change the color mode and depth. Their original values are recorded
+        # before the file format, so the original file format is restored first and accepts them again.
+        image_settings = scene.render.image_settings
+        snapshot.set(image_settings, "color_mode", image_settings.color_mode)
+        snapshot.set(image_settings, "color_depth", image_settings.color_depth)
+        snapshot.set(image_settings, "quality", image_settings.quality)
+        snapshot.set(image_settings, "file_format", render_settings.file_format)
+        snapshot.set(scene.render, "resolution_x", render_settings.resolution_x)
+        snapshot.set(scene.render, "resolution_y", render_settings.resolution_y)
+        snapshot.set(scene.render, "resolution_percentage", render_settings.resolution_percentage)
+
+        # Output directory and image manifest
+        output_info = {}
+        output_info["directory"] = bpy.path.abspath(render_settings.output_directory)
+        if not os.path.exists(output_info["directory"]):
+            os.makedirs(output_info["directory"])
+        output_info["manifest"] = RenderManifest(output_info["directory"]) if render_settings.write_manifest else None
+        if output_info["manifest"]:
+            # Closes the manifest when the run fails, the snapshot is restored in any case
+            snapshot.on_restore(output_info["manifest"].close)
+        output_info["settings_hash"] = get_settings_hash(render_settings)
+        output_info["incremental_directory"] = os.path.join(output_info["directory"], INCREMENTAL_DIRECTORY_NAME)
+        output_info["changed_files"] = []
+        output_info["mesh_statistics"] = mesh_statistics
+        output_info["framing_cache"] = FramingCache(output_info["directory"], mesh_statistics) if render_settings.use_framing_cache else None
+        output_info["uploads"] = [] if render_settings.upload_url else None
+        if render_settings.incremental_output and not os.path.exists(output_info["incremental_directory"]):
+            os.makedirs(output_info["incremental_directory"])
+
+        progress_info["phase_timings"]["setup"] = time.perf_counter() - progress_info["start_time"]
+
+        # Optionally profile the first parts of the run
+        profiler = None
+        if render_settings.profile_run:
+            profiler = RenderProfiler(render_settings.profile_part_limit, render_settings.profile_top_n)
+            profiler.start()
 
         # Main rendering loop
         for obj in render_objects:
             bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='BOUNDS')
-
-            # Show current object and hide other mesh objects
-            obj.hide_render = False
-            bpy.ops.object.select_all(action='DESELECT')
-            obj.select_set(True)
-            for other_obj in bpy.context.visible_objects:
-                if other_obj != obj and other_obj.type == 'MESH':
-                    other_obj.hide_render = True
-
-            # Store original rotation
-            original_rotation = obj.rotation_euler.copy()
-
-            # Render images
-            render_images(obj, camera_obj, render_settings, views, progress_info)
-            
-            # Restore original rotation
-            obj.rotation_euler = original_rotation
-
-            obj.hide_render = True
-            for other_obj in bpy.context.visible_objects:
-                if other_obj != obj and other_obj.type == 'MESH':
-                    other_obj.hide_render = False
-
-        scene.render.filepath = original_output_path
-        scene.render.resolution_x = original_resolution_x
-        scene.render.resolution_y = original_resolution_y
-        scene.render.resolution_percentage = original_percentage
-
-        bpy.data.objects.remove(camera_obj)
-        bpy.data.cameras.remove(camera)
-        scene.camera = original_camera
-
-        scene.use_nodes = original_use_scene_nodes
-
-        scene.render.film_transparent = original_film_transparent
-        world.use_nodes = original_use_nodes
-
-        restore_original_node_tree(world, original_node_tree)
-
-        # Revert color management settings
-        scene.view_settings.view_transform = original_view_transform
-        scene.view_settings.look = original_look
-
-        # End progress bar
-        progress_info["wm"].progress_end()
-
+            if obj.type == 'MESH':
+                bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='BOUNDS')
+                mesh_statistics.discard(obj.data)
+
+            # Visibility and rotation changed for one part are restored after the part, also when it fails
+            with SceneSnapshot() as part_snapshot:
+                # Objects instanced by the current object, including nested collection instances, have to be
+                # visible in the render
+                instance_sources = set()
+                if is_collection_instance(obj):
+                    instanced_objects = [child for child, matrix in get_instanced_meshes(obj.instance_collection)]
+                    for child in instanced_objects + get_nested_instancers(obj.instance_collection):
+                        if child not in instance_sources:
+                            instance_sources.add(child)
+                            part_snapshot.set(child, "hide_render", False)
+
+                # Show current object and hide other mesh objects and collection instances
+                part_snapshot.set(obj, "hide_render", False)
+                bpy.ops.object.select_all(action='DESELECT')
+                obj.select_set(True)
+                for other_obj in bpy.context.visible_objects:
+                    if other_obj != obj and other_obj not in instance_sources and (other_obj.type == 'MESH' or is_collection_instance(other_obj)):
+                        part_snapshot.set(other_obj, "hide_render", True)
+
+                # Store original rotation
+                part_snapshot.set(obj, "rotation_euler", obj.rotation_euler)
+
+                # Render images
+                progress_info["events"].emit("part_started", object=obj.name)
+                saved_materials = apply_material_override(obj, render_settings)
+                if profiler:
+                    profiler.begin_part(progress_info["phase_timings"]["render"])
+                try:
+                    render_images(obj, camera_obj, render_settings, views, progress_info, output_info)
+                except Exception as error:
+                    progress_info["events"].emit("error", object=obj.name, message=str(error))
+                    progress_info["events"].close()
+                    if profiler:
+                        profiler.stop()
+                    raise
+                finally:
+                    restore_materials(obj, saved_materials)
+                    if profiler:
+                        profiler.end_part(progress_info["phase_timings"]["render"])
+
+        if profiler:
+            profiler.stop()
+            profile_path = profiler.write(output_info["directory"])
+            self.report({'INFO'}, f"Profile written to {profile_path}")
+
+        restore_start_time = time.perf_counter()
+        if output_info["framing_cache"]:
+            output_info["framing_cache"].save()
+            progress_info["events"].emit("framing_cache", hits=output_info["framing_cache"].hits,
+                                         entries=len(output_info["framing_cache"].framings))
+
+        if output_info["manifest"]:
+            output_info["manifest"].close()
+
+        if render_settings.incremental_output:
+            run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+            write_changed_files(output_info["directory"], output_info["changed_files"], run_id)
+            progress_info["events"].emit("changed_files", run_id=run_id, count=len(output_info["changed_files"]))
+
+        # Upload the images of this run to the media server
+        upload_summary = None
+        if output_info["uploads"]:
+            try:
+                uploader = MediaUploader(render_settings.upload_url, concurrency=render_settings.upload_concurrency)
+            except ValueError as e:
+                self.report({'ERROR'}, str(e))
+            else:
+                upload_summary = upload_files(uploader, output_info["uploads"], UploadState(output_info["directory"]))
+                progress_info["phase_timings"]["upload"] = upload_summary["duration"]
+                progress_info["events"].emit("upload_finished", **upload_summary)
+                for error in upload_summary["errors"]:
+                    print(error)
+                self.report({'WARNING'} if upload_summary["failed"] else {'INFO'},
+                            f"Uploaded {upload_summary['uploaded']} images, skipped {upload_summary['skipped']}, "
+                            f"{upload_summary['failed']} failed, {upload_summary['bytes_per_second'] / 1e6:.1f} MB/s")
+
+        # Restore the scene and end the progress bar
+        snapshot.restore()
+
+        progress_info["phase_timings"]["restore"] = time.perf_counter() - restore_start_time - progress_info["phase_timings"]["upload"]
+        duration = time.perf_counter() - progress_info["start_time"]
+        progress_info["events"].emit("run_finished", images=progress_info["current_image_number"], duration=duration,
+                                     images_per_hour=progress_info["current_image_number"] * 3600.0 / max(duration, 1e-6),
+                                     upload_bytes_per_second=upload_summary["bytes_per_second"] if upload_summary else None,
+                                     phases=progress_info["phase_timings"])
+        progress_info["events"].close()
+
+        last_run_summary.update(images=progress_info["current_image_number"], duration=duration,
+                                changed_files=len(output_info["changed_files"]))
         return {'FINISHED'}
 
 
@@ -345,18 +632,40 @@ class RENDER_PT_automated_object_renderer_panel(bpy.types.Panel):
         render_settings = context.scene.automated_object_renderer
 
         layout.prop(render_settings, "output_directory")
+        layout.prop(render_settings, "output_layout")
+        if render_settings.output_layout != "FLAT":
+            layout.prop(render_settings, "shard_length")
+        layout.prop(render_settings, "write_manifest")
+        layout.prop(render_settings, "incremental_output")
+        if render_settings.incremental_output:
+            layout.prop(render_settings, "min_similarity")
         layout.prop(render_settings, "file_format")
+        draw_output_format_settings(layout, render_settings)
         layout.prop(render_settings, "resolution_x")
         layout.prop(render_settings, "resolution_y")
         layout.prop(render_settings, "resolution_percentage")
         layout.prop(render_settings, "zoom_factor")
+        layout.prop(render_settings, "use_framing_cache")
         layout.prop(render_settings, "background_option")
+        draw_material_override_settings(layout, render_settings)
         layout.prop(render_settings, "isometric_view")
         layout.prop(render_settings, "side_view")
         layout.prop(render_settings, "top_view")
         layout.prop(render_settings, "rotation_steps")
         layout.prop(render_settings, "duplicate_filter")
+        layout.prop(render_settings, "work_list_file")
+        layout.prop(render_settings, "upload_url")
+        if render_settings.upload_url:
+            layout.prop(render_settings, "upload_concurrency")
+        layout.prop(render_settings, "event_target")
+        if render_settings.event_target:
+            layout.prop(render_settings, "event_interval")
+        layout.prop(render_settings, "profile_run")
+        if render_settings.profile_run:
+            layout.prop(render_settings, "profile_part_limit")
+            layout.prop(render_settings, "profile_top_n")
         layout.operator(RENDER_OT_automated_object_renderer.bl_idname)
+        layout.operator("render.batch_render_blend_files")
 
 
 class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
@@ -365,6 +674,41 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
         subtype='DIR_PATH',
         default="C:/",
     )
+    incremental_output: bpy.props.BoolProperty(
+        name="Incremental Output",
+        description="Keep existing images that are not visibly different from the new render and list the changed files",
+        default=False,
+    )
+    min_similarity: bpy.props.FloatProperty(
+        name="Min Similarity",
+        description="Structural similarity above which a new render counts as unchanged",
+        default=0.995,
+        min=0.0,
+        max=1.0,
+        precision=4,
+    )
+    output_layout: bpy.props.EnumProperty(
+        name="Output Layout",
+        description="How images are distributed over subdirectories of the output directory",
+        items=[
+            ("FLAT", "Flat", "Write all images directly into the output directory"),
+            ("NAME_PREFIX", "Name Prefix", "Shard images into subdirectories named after a prefix of the object name"),
+            ("HASH", "Name Hash", "Shard images into subdirectories named after a prefix of the object name hash"),
+        ],
+        default="FLAT",
+    )
+    shard_length: bpy.props.IntProperty(
+        name="Shard Length",
+        description="Number of characters of the name or hash used for the subdirectory name",
+        default=2,
+        min=1,
+        max=8
+    )
+    write_manifest: bpy.props.BoolProperty(
+        name="Write Manifest",
+        description="Index every rendered image in a SQLite manifest in the output directory",
+        default=False,
+    )
     file_format: bpy.props.EnumProperty(
         name="File Format",
         items=[
@@ -374,6 +718,7 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
         ],
         default='PNG',
     )
+    extra_formats: bpy.props.CollectionProperty(type=OutputFormat)
     zoom_factor: bpy.props.FloatProperty(
         name="Zoom Factor",
         description="Adjust the zoom factor for the camera when rendering objects",
@@ -381,6 +726,11 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
         min=0.01,
         max=0.3
     )
+    use_framing_cache: bpy.props.BoolProperty(
+        name="Framing Cache",
+        description="Reuse camera framing for identical geometry and views, also across runs into the same output directory",
+        default=False,
+    )
     background_option: bpy.props.EnumProperty(
         name="Background",
         description="Choose the background option for rendering",
@@ -390,6 +740,22 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
         ],
         default="TRANSPARENT",
     )
+    material_override: bpy.props.EnumProperty(
+        name="Material Override",
+        description="Temporarily replace the materials of each object while it is rendered",
+        items=[
+            ("NONE", "None", "Render with the original materials"),
+            ("SINGLE", "Single Material", "Render every object with one shared material"),
+            ("PALETTE", "Palette", "Replace materials by name pattern, falling back to the override material"),
+        ],
+        default="NONE",
+    )
+    override_material: bpy.props.PointerProperty(
+        name="Override Material",
+        description="Shared material used for rendering",
+        type=bpy.types.Material,
+    )
+    material_override_rules: bpy.props.CollectionProperty(type=MaterialOverrideRule)
     duplicate_filter: bpy.props.EnumProperty(
         name="Duplicate Filter(s)",
         description="Filtering method to exclude duplicate objects from rendering",
@@ -397,6 +763,7 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
             ("NAME_SUFFIX_+_MESH_DATA", "Name Suffix + Mesh Data", "Filter duplicates using name suffix and mesh data filters"),
             ("NAME_SUFFIX", "Name Suffix", "Filter duplicates using name suffix filter"),
             ("MESH_DATA", "Mesh Data", "Filter duplicates using mesh data filter"),
+            ("GEOMETRY", "Geometry", "Filter duplicates with identical vertex positions, even in different mesh data"),
             ("NONE", "None", "No duplicate filtering"),
         ],
         default="NAME_SUFFIX",
@@ -417,6 +784,60 @@ class AutomatedObjectRendererSettings(bpy.types.PropertyGroup):
     resolution_y: bpy.props.IntProperty(name="Resolution Y", default=1000, min=1)
     resolution_percentage: bpy.props.IntProperty(name="Percentage", default=100, min=1, max=100, subtype='PERCENTAGE')
 
+    event_target: bpy.props.StringProperty(
+        name="Event Target",
+        description="File, FIFO, tcp://host:port or unix:///path that receives JSON lines progress events",
+        default="",
+    )
+    event_interval: bpy.props.FloatProperty(
+        name="Event Interval",
+        description="Minimum number of seconds between writes of buffered image events",
+        default=1.0,
+        min=0.0,
+    )
+    profile_run: bpy.props.BoolProperty(
+        name="Profile Run",
+        description="Profile the run with cProfile and write a .prof file and a summary into the output directory",
+        default=False,
+    )
+    profile_part_limit: bpy.props.IntProperty(
+        name="Profiled Parts",
+        description="Number of parts at the start of the run that are profiled",
+        default=10,
+        min=1,
+    )
+    profile_top_n: bpy.props.IntProperty(
+        name="Summary Functions",
+        description="Number of functions listed in the profile summary",
+        default=30,
+        min=1,
+    )
+    work_list_file: bpy.props.StringProperty(
+        name="Work List",
+        description="Media import workbook whose ProductImages SKUs are rendered, skipping SKUs whose main image exists",
+        subtype='FILE_PATH',
+        default="",
+    )
+    upload_url: bpy.props.StringProperty(
+        name="Upload URL",
+        description="Media server the rendered images are uploaded to after the run. "
+                    "The access token is read from the MEDIA_UPLOAD_TOKEN environment variable",
+        default="",
+    )
+    upload_concurrency: bpy.props.IntProperty(
+        name="Upload Connections",
+        description="Number of images uploaded at the same time",
+        default=4,
+        min=1,
+        max=32,
+    )
+    queue_file: bpy.props.StringProperty(
+        name="Queue File",
+        description="Shared render queue database used by distributed render workers",
+        subtype='FILE_PATH',
+        default="",
+    )
+
 
 def register():
     bpy.utils.register_class(AutomatedObjectRendererSettings)
@@ -0,0 +1,193 @@
+import glob
+import json
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import bpy
+
+from .automated_parts_renderer import settings_to_dict
+
+
+# Script run by each background Blender: register the add-on unless the saved preferences enable it, apply
+# the settings profile, select all meshes and collection instances and render them. A cancelled render
+# exits with an error so the file is reported as failed.
+RENDER_SCRIPT = """
+import bpy, importlib, json, sys
+profile_path, events_path = sys.argv[sys.argv.index("--") + 1:][:2]
+with open(profile_path) as profile_file:
+    profile = json.load(profile_file)
+if not hasattr(bpy.types.Scene, "automated_object_renderer"):
+    sys.path.insert(0, profile["addon_parent_directory"])
+    importlib.import_module(profile["addon_module"]).register()
+render_settings = bpy.context.scene.automated_object_renderer
+renderer = importlib.import_module(profile["renderer_module"])
+renderer.apply_settings_dict(render_settings, profile["settings"], profile["library_file"])
+render_settings.event_target = events_path
+render_settings.event_interval = 0.0
+for obj in bpy.context.view_layer.objects:
+    obj.select_set(obj.type == 'MESH' or (obj.instance_type == 'COLLECTION' and obj.instance_collection is not None))
+if 'FINISHED' not in bpy.ops.render.automated_object_renderer():
+    print("Render was cancelled")
+    sys.exit(1)
+"""
+
+
+# Run a Python expression or script file in a background Blender, optionally with a .blend file opened
+def run_background_blender(python_expr, args=(), blend_file=None, threads=0, python_file=None):
+    command = [bpy.app.binary_path, "--background"]
+    if blend_file:
+        command.append(blend_file)
+    if threads:
+        command += ["--threads", str(threads)]
+    command += ["--python-exit-code", "1"]
+    if python_file:
+        command += ["--python", python_file, "--"]
+    else:
+        command += ["--python-expr", python_expr, "--"]
+    command += list(args)
+    return subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+
+def find_blend_files(pattern):
+    pattern = bpy.path.abspath(pattern)
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.blend")
+    return sorted(glob.glob(pattern))
+
+
+# Summarize the progress events written by one background render
+def read_events_report(events_path):
+    report = {"images": 0, "parts": 0, "skipped": 0, "uploaded": 0, "upload_bytes": 0, "upload_duration": 0.0, "errors": []}
+    if not os.path.exists(events_path):
+        return report
+
+    with open(events_path, encoding="utf-8") as events_file:
+        for line in events_file:
+            event = json.loads(line)
+            if event["event"] == "image_written":
+                report["images"] += 1
+            elif event["event"] == "part_started":
+                report["parts"] += 1
+            elif event["event"] == "part_skipped":
+                report["skipped"] += 1
+            elif event["event"] == "upload_finished":
+                report["uploaded"] += event["uploaded"]
+                report["upload_bytes"] += event["bytes"]
+                report["upload_duration"] += event["duration"]
+                report["errors"] += event["errors"]
+            elif event["event"] == "error":
+                report["errors"].append(f"{event['object']}: {event['message']}")
+    return report
+
+
+def render_blend_file(blend_file, profile_path, events_path, threads):
+    start_time = time.perf_counter()
+    process = run_background_blender(RENDER_SCRIPT, (profile_path, events_path), blend_file, threads)
+
+    report = read_events_report(events_path)
+    report["blend_file"] = blend_file
+    report["return_code"] = process.returncode
+    report["duration"] = time.perf_counter() - start_time
+    if process.returncode != 0:
+        report["errors"].append(process.stdout[-2000:])
+    return report
+
+
+class RENDER_OT_batch_render_blend_files(bpy.types.Operator):
+    bl_idname = "render.batch_render_blend_files"
+    bl_label = "Batch Render .blend Files"
+    bl_description = "Render all mesh objects of many .blend files with the current settings, one background Blender per file"
+
+    files_pattern: bpy.props.StringProperty(
+        name="Files",
+        description="Directory or glob pattern of the .blend files to render",
+        subtype='FILE_PATH',
+        default="",
+    )
+    max_processes: bpy.props.IntProperty(
+        name="Max Processes",
+        description="Number of background Blender processes rendering at the same time",
+        default=max(1, (os.cpu_count() or 1) // 4),
+        min=1,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        blend_files = find_blend_files(self.files_pattern)
+        if not blend_files:
+            self.report({'ERROR'}, "No .blend files found")
+            return {'CANCELLED'}
+
+        # The same settings profile is applied to every file, with all paths made absolute since relative
+        # paths would resolve against each rendered .blend file
+        render_settings = context.scene.automated_object_renderer
+        settings = settings_to_dict(render_settings)
+        for prop in render_settings.bl_rna.properties:
+            if prop.type == 'STRING' and prop.subtype in {'FILE_PATH', 'DIR_PATH'} and settings[prop.identifier]:
+                settings[prop.identifier] = bpy.path.abspath(settings[prop.identifier])
+        settings["event_target"] = ""
+        if not os.path.exists(settings["output_directory"]):
+            os.makedirs(settings["output_directory"])
+
+        # Override materials are looked up by name in each file and appended from this file when missing
+        if render_settings.material_override != "NONE" and not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the .blend file so that batch renders can load its override materials")
+            return {'CANCELLED'}
+        profile = {
+            "addon_parent_directory": os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "addon_module": __package__,
+            "renderer_module": settings_to_dict.__module__,
+            "library_file": bpy.data.filepath,
+            "settings": settings,
+        }
+
+        threads = max(1, (os.cpu_count() or 1) // self.max_processes)
+        start_time = time.perf_counter()
+
+        with tempfile.TemporaryDirectory() as work_directory:
+            profile_path = os.path.join(work_directory, "profile.json")
+            with open(profile_path, "w") as profile_file:
+                json.dump(profile, profile_file)
+
+            with ThreadPoolExecutor(max_workers=self.max_processes) as executor:
+                reports = list(executor.map(
+                    lambda index: render_blend_file(blend_files[index], profile_path, os.path.join(work_directory, f"events_{index}.jsonl"), threads),
+                    range(len(blend_files)),
+                ))
+
+        # Merge the per-file reports into one run summary
+        summary = {
+            "files": reports,
+            "file_count": len(reports),
+            "failed_files": sum(1 for report in reports if report["return_code"] != 0 or report["errors"]),
+            "images": sum(report["images"] for report in reports),
+            "parts": sum(report["parts"] for report in reports),
+            "skipped": sum(report["skipped"] for report in reports),
+            "uploaded": sum(report["uploaded"] for report in reports),
+            "upload_bytes": sum(report["upload_bytes"] for report in reports),
+            "duration": time.perf_counter() - start_time,
+        }
+        summary["images_per_hour"] = summary["images"] * 3600.0 / max(summary["duration"], 1e-6)
+        summary["upload_bytes_per_second"] = summary["upload_bytes"] / max(
+            sum(report["upload_duration"] for report in reports), 1e-6)
+        with open(os.path.join(settings["output_directory"], "batch_summary.json"), "w") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+        message = f"Rendered {summary['images']} images of {summary['parts']} parts from {len(reports)} files in {summary['duration']:.0f}s"
+        if summary["failed_files"]:
+            self.report({'WARNING'}, f"{message}, {summary['failed_files']} files had errors")
+        else:
+            self.report({'INFO'}, message)
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(RENDER_OT_batch_render_blend_files)
+
+
+def unregister():
+    bpy.utils.unregister_class(RENDER_OT_batch_render_blend_files)
@@ -0,0 +1,262 @@
+# Benchmark the Automated Parts Renderer on synthetic part catalogs.
+#
+# Run with Blender in the background, for example:
+#
+#     blender --background --factory-startup --python benchmark.py -- \
+#         --parts 10 50 100 --engines WORKBENCH EEVEE CYCLES --output bench.json
+#
+# Every configuration is rendered in its own background Blender so that peak
+# memory is measured per run. Pass --compare with an earlier result file to
+# print the relative throughput of the two versions.
+
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import bmesh
+import bpy
+
+
+ADDON_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ENGINES = {
+    "WORKBENCH": ["BLENDER_WORKBENCH"],
+    "EEVEE": ["BLENDER_EEVEE_NEXT", "BLENDER_EEVEE"],
+    "CYCLES": ["CYCLES"],
+}
+
+
+def parse_arguments():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="benchmark.py")
+    parser.add_argument("--parts", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=["WORKBENCH"])
+    parser.add_argument("--triangles", type=int, default=5000, help="Approximate triangles per part, rounded to the nearest icosphere level")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.25, help="Fraction of parts that are duplicates")
+    parser.add_argument("--noise-ratio", type=float, default=0.5, help="Fraction of parts with noise-displaced geometry")
+    parser.add_argument("--resolution", type=int, default=256)
+    parser.add_argument("--rotation-steps", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+# Register the add-on from this directory so that the benchmark works with --factory-startup
+def register_addon():
+    sys.path.insert(0, os.path.dirname(ADDON_DIRECTORY))
+    addon = importlib.import_module(os.path.basename(ADDON_DIRECTORY))
+    addon.register()
+    return addon
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+# Create a mesh of about the requested triangle count, optionally displaced with noise.
+# An icosphere has 20 * 4^(subdivisions - 1) triangles, so the level closest to the request is used.
+def create_part_mesh(name, triangles, noisy, rng):
+    subdivisions = 1 + max(0, round(math.log(max(triangles, 20) / 20.0, 4)))
+    bm = bmesh.new()
+    try:
+        bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, radius=1.0)
+    except TypeError:
+        bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, diameter=1.0)
+
+    scale = (rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0))
+    for vertex in bm.verts:
+        offset = rng.uniform(-0.05, 0.05) if noisy else 0.0
+        vertex.co = vertex.co * (1.0 + offset)
+        vertex.co.x *= scale[0]
+        vertex.co.y *= scale[1]
+        vertex.co.z *= scale[2]
+
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+# Build a catalog of parts laid out on a grid, with duplicates that share mesh data and a name suffix
+def generate_catalog(part_count, triangles, duplicate_ratio, noise_ratio, seed):
+    rng = random.Random(seed)
+    collection = bpy.context.scene.collection
+    columns = max(1, math.ceil(math.sqrt(part_count)))
+    originals = []
+
+    for index in range(part_count):
+        if originals and rng.random() < duplicate_ratio:
+            original = rng.choice(originals)
+            obj = bpy.data.objects.new(original.name + ".001", original.data)
+        else:
+            name = f"PART-{index:06d}"
+            obj = bpy.data.objects.new(name, create_part_mesh(name, triangles, rng.random() < noise_ratio, rng))
+            originals.append(obj)
+
+        obj.location = (index % columns * 5.0, index // columns * 5.0, 0.0)
+        collection.objects.link(obj)
+
+    return originals
+
+
+def set_render_engine(scene, engine):
+    for identifier in ENGINES[engine]:
+        try:
+            scene.render.engine = identifier
+            break
+        except TypeError:
+            continue
+
+    if engine == "CYCLES":
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = 16
+    elif engine == "EEVEE":
+        scene.eevee.taa_render_samples = 16
+
+
+def get_peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# Render one configuration in this process and return its measurements
+def run_one(configuration):
+    register_addon()
+    clear_scene()
+    scene = bpy.context.scene
+
+    generate_start = time.perf_counter()
+    originals = generate_catalog(configuration["parts"], configuration["triangles"], configuration["duplicate_ratio"],
+                                 configuration["noise_ratio"], configuration["seed"])
+    part_triangles = len(originals[0].data.polygons) if originals else 0
+    generate_duration = time.perf_counter() - generate_start
+
+    set_render_engine(scene, configuration["engine"])
+    with tempfile.TemporaryDirectory() as output_directory:
+        events_path = os.path.join(output_directory, "events.jsonl")
+        render_settings = scene.automated_object_renderer
+        render_settings.output_directory = output_directory
+        render_settings.resolution_x = configuration["resolution"]
+        render_settings.resolution_y = configuration["resolution"]
+        render_settings.rotation_steps = configuration["rotation_steps"]
+        render_settings.event_target = events_path
+        render_settings.event_interval = 0.0
+
+        for obj in bpy.context.view_layer.objects:
+            obj.select_set(obj.type == 'MESH')
+
+        render_start = time.perf_counter()
+        bpy.ops.render.automated_object_renderer()
+        render_duration = time.perf_counter() - render_start
+
+        run_finished = {}
+        with open(events_path, encoding="utf-8") as events_file:
+            for line in events_file:
+                event = json.loads(line)
+                if event["event"] == "run_finished":
+                    run_finished = event
+
+    images = run_finished.get("images", 0)
+    return dict(
+        configuration,
+        images=images,
+        part_triangles=part_triangles,
+        generate_duration=generate_duration,
+        duration=render_duration,
+        images_per_second=images / render_duration if render_duration > 0 else 0.0,
+        phases=run_finished.get("phases", {}),
+        peak_rss_kb=get_peak_rss_kb(),
+    )
+
+
+def run_in_background_blender(configuration):
+    with tempfile.TemporaryDirectory() as work_directory:
+        configuration_path = os.path.join(work_directory, "configuration.json")
+        with open(configuration_path, "w") as configuration_file:
+            json.dump(configuration, configuration_file)
+
+        command = [bpy.app.binary_path, "--background", "--factory-startup", "--python-exit-code", "1",
+                   "--python", os.path.abspath(__file__), "--", "--run-one", configuration_path]
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        if process.returncode != 0:
+            return dict(configuration, error=process.stdout[-2000:])
+
+        with open(configuration_path + ".result") as result_file:
+            return json.load(result_file)
+
+
+def compare_results(results, previous_results):
+    previous = {(run["engine"], run["parts"]): run for run in previous_results["runs"] if "error" not in run}
+    print("engine      parts   images/s   previous   change")
+    for run in results["runs"]:
+        old_run = previous.get((run["engine"], run["parts"]))
+        if "error" in run or not old_run or not old_run["images_per_second"]:
+            continue
+        change = run["images_per_second"] / old_run["images_per_second"] - 1.0
+        print(f"{run['engine']:<10}{run['parts']:>7}{run['images_per_second']:>11.2f}{old_run['images_per_second']:>11.2f}{change:>+9.1%}")
+
+
+def main():
+    arguments = parse_arguments()
+
+    if arguments.run_one:
+        with open(arguments.run_one) as configuration_file:
+            configuration = json.load(configuration_file)
+        result = run_one(configuration)
+        with open(arguments.run_one + ".result", "w") as result_file:
+            json.dump(result, result_file)
+        return
+
+    results = {
+        "blender_version": bpy.app.version_string,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "created_at": time.time(),
+        "runs": [],
+    }
+    for engine in arguments.engines:
+        for part_count in sorted(arguments.parts):
+            configuration = {
+                "engine": engine,
+                "parts": part_count,
+                "triangles": arguments.triangles,
+                "duplicate_ratio": arguments.duplicate_ratio,
+                "noise_ratio": arguments.noise_ratio,
+                "resolution": arguments.resolution,
+                "rotation_steps": arguments.rotation_steps,
+                "seed": arguments.seed,
+            }
+            run = run_in_background_blender(configuration)
+            results["runs"].append(run)
+            if "error" in run:
+                print(f"{engine} with {part_count} parts failed:\n{run['error']}")
+            else:
+                print(f"{engine} with {part_count} parts of {run['part_triangles']} triangles: {run['images']} images, {run['images_per_second']:.2f} images/s, "
+                      f"peak RSS {run['peak_rss_kb']} KB")
+
+    with open(arguments.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as previous_file:
+            compare_results(results, json.load(previous_file))
+
+
+if __name__ == "__main__":
+    main()
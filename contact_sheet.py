@@ -0,0 +1,80 @@
+import hashlib
+import math
+import os
+import bpy
+import numpy as np
+
+
+CONTACT_SHEET_DIRECTORY_NAME = ".contact_sheets"
+BACKGROUND_COLOR = (0.2, 0.2, 0.2, 1.0)
+
+
+def get_grid_size(image_count):
+    columns = max(1, math.ceil(math.sqrt(image_count)))
+    rows = max(1, math.ceil(image_count / columns))
+    return columns, rows
+
+
+# Tile position of a point in normalized image coordinates, counting tiles row by row from the top left
+def get_tile_at(u, v, image_count):
+    columns, rows = get_grid_size(image_count)
+    if not (0.0 <= u < 1.0 and 0.0 <= v < 1.0):
+        return None
+
+    tile = int((1.0 - v) * rows) * columns + int(u * columns)
+    return tile if tile < image_count else None
+
+
+# Cache file name that changes whenever one of the candidate images changes
+def get_contact_sheet_path(directory, object_name, image_paths, tile_size):
+    checksum = hashlib.sha1(f"{object_name}:{tile_size}".encode("utf-8"))
+    for path in image_paths:
+        stat = os.stat(path)
+        checksum.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return os.path.join(directory, CONTACT_SHEET_DIRECTORY_NAME, checksum.hexdigest() + ".png")
+
+
+# Load an image downsampled to fit into a tile, as a (height, width, 4) float array
+def load_tile_pixels(path, tile_size):
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        width, height = image.size
+        scale = tile_size / max(width, height, 1)
+        width = max(1, int(width * scale))
+        height = max(1, int(height * scale))
+        image.scale(width, height)
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)
+
+
+# Build a grid mosaic of the images, or load it from the cache directory if it is up to date
+def get_contact_sheet(directory, object_name, image_paths, tile_size):
+    sheet_path = get_contact_sheet_path(directory, object_name, image_paths, tile_size)
+    if os.path.exists(sheet_path):
+        return bpy.data.images.load(sheet_path, check_existing=True)
+
+    columns, rows = get_grid_size(len(image_paths))
+    mosaic = np.empty((rows * tile_size, columns * tile_size, 4), dtype=np.float32)
+    mosaic[:] = BACKGROUND_COLOR
+
+    for tile, path in enumerate(image_paths):
+        pixels = load_tile_pixels(path, tile_size)
+        row, column = divmod(tile, columns)
+
+        # Pixel rows are stored bottom to top, so the first row of tiles ends at the top of the mosaic
+        x = column * tile_size + (tile_size - pixels.shape[1]) // 2
+        y = (rows - 1 - row) * tile_size + (tile_size - pixels.shape[0]) // 2
+        alpha = pixels[..., 3:4]
+        region = mosaic[y:y + pixels.shape[0], x:x + pixels.shape[1]]
+        region[..., :3] = pixels[..., :3] * alpha + region[..., :3] * (1.0 - alpha)
+
+    os.makedirs(os.path.dirname(sheet_path), exist_ok=True)
+    sheet = bpy.data.images.new(f"Contact Sheet {object_name}", columns * tile_size, rows * tile_size, alpha=True)
+    sheet.pixels.foreach_set(mosaic.ravel())
+    sheet.filepath_raw = sheet_path
+    sheet.file_format = 'PNG'
+    sheet.save()
+    return sheet
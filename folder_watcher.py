@@ -0,0 +1,71 @@
+import os
+
+from .image_index import is_image_file
+from .output_formats import is_extra_format_path
+from .pick_journal import OMITTED_DIRECTORY_NAME
+
+
+# Polls an images folder for new images while it is being rendered into, using only directory metadata.
+# A directory is only listed again when its modification time changed, and a file is only reported once
+# its size stayed the same for two polls, so images that are still being written are not loaded.
+class FolderWatcher:
+    def __init__(self, directory, known_paths=()):
+        self.directory = directory
+        self.known = {os.path.relpath(path, directory) for path in known_paths}
+        self.directory_mtimes = {}
+        self.subdirectories = {}
+        self.pending_sizes = {}
+
+    # Omitted images, extra formats and the renderer's hidden working folders are not reviewed
+    def is_watched_directory(self, relative_path):
+        name = os.path.basename(relative_path)
+        return not name.startswith(".") and name != OMITTED_DIRECTORY_NAME and not is_extra_format_path(relative_path)
+
+    def scan(self, relative_directory, found):
+        path = os.path.join(self.directory, relative_directory)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            self.directory_mtimes.pop(relative_directory, None)
+            self.subdirectories.pop(relative_directory, None)
+            return
+
+        if self.directory_mtimes.get(relative_directory) != mtime:
+            self.directory_mtimes[relative_directory] = mtime
+            subdirectories = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    relative_path = os.path.join(relative_directory, entry.name) if relative_directory else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.is_watched_directory(relative_path):
+                            subdirectories.append(relative_path)
+                    elif is_image_file(entry.name) and relative_path not in self.known:
+                        found[relative_path] = entry.stat().st_size
+            self.subdirectories[relative_directory] = subdirectories
+
+        for subdirectory in self.subdirectories.get(relative_directory, []):
+            self.scan(subdirectory, found)
+
+    # Return the paths of the images that appeared and finished writing since the last poll
+    def poll(self):
+        found = {}
+        self.scan("", found)
+
+        # Files still being written may not change their directory's modification time again
+        for relative_path in self.pending_sizes:
+            if relative_path not in found:
+                try:
+                    found[relative_path] = os.stat(os.path.join(self.directory, relative_path)).st_size
+                except FileNotFoundError:
+                    pass
+
+        new_paths = []
+        pending_sizes = {}
+        for relative_path, size in found.items():
+            if size and self.pending_sizes.get(relative_path) == size:
+                self.known.add(relative_path)
+                new_paths.append(os.path.join(self.directory, relative_path))
+            else:
+                pending_sizes[relative_path] = size
+        self.pending_sizes = pending_sizes
+        return new_paths
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+
+from .mesh_statistics import MeshStatisticsCache
+
+
+FRAMING_CACHE_FILE_NAME = "framing_cache.json"
+
+
+# Camera framing per unique geometry and view, stored as the camera offset from the object center.
+# Geometry is identified by the fingerprints of the run's mesh statistics.
+class FramingCache:
+    def __init__(self, output_directory, mesh_statistics=None):
+        self.path = os.path.join(output_directory, FRAMING_CACHE_FILE_NAME)
+        self.mesh_statistics = mesh_statistics if mesh_statistics is not None else MeshStatisticsCache()
+        self.framings = self.load()
+        self.hits = 0
+
+    # Read the framings on disk. Renderers sharing the output directory write the same cache, so a cache
+    # that cannot be read is treated as empty rather than failing the run.
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                framings = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return framings if isinstance(framings, dict) else {}
+
+    # Fingerprint of everything a collection instance renders, including the placement of each mesh
+    def get_instance_fingerprint(self, instanced_meshes):
+        checksum = hashlib.sha1()
+        for child, matrix in instanced_meshes:
+            checksum.update(self.mesh_statistics.get(child.data).fingerprint.encode("utf-8"))
+            checksum.update(repr([round(value, 4) for row in matrix for value in row]).encode("utf-8"))
+        return checksum.hexdigest()
+
+    # The key covers the geometry, the object's rotation and scale, the view and the camera settings.
+    # Views are keyed by name rather than camera direction, since the isometric camera starts from a fixed
+    # world position and its direction would differ for every placement of the same part.
+    # Objects with modifiers are framed by their evaluated geometry, which the key does not cover, so
+    # they get no key and are not cached.
+    def get_key(self, obj, view, zoom_factor, camera_angle, instanced_meshes=None):
+        if instanced_meshes is not None:
+            if any(child.modifiers for child, matrix in instanced_meshes):
+                return None
+            fingerprint = self.get_instance_fingerprint(instanced_meshes)
+        else:
+            if obj.modifiers:
+                return None
+            fingerprint = self.mesh_statistics.get(obj.data).fingerprint
+        transform = [round(value, 4) for row in obj.matrix_world.to_3x3() for value in row]
+        return json.dumps([fingerprint, view, transform, round(zoom_factor, 6), round(camera_angle, 6)])
+
+    def get(self, key):
+        framing = self.framings.get(key)
+        if framing:
+            self.hits += 1
+        return framing
+
+    def set(self, key, offset, rotation):
+        self.framings[key] = {"offset": list(offset), "rotation": list(rotation)}
+
+    # Merge the framings with the ones other renderers saved meanwhile and replace the file in one step,
+    # so readers never see a partly written cache
+    def save(self):
+        framings = self.load()
+        framings.update(self.framings)
+        self.framings = framings
+
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.framings, cache_file)
+        os.replace(temporary_path, self.path)
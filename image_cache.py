@@ -0,0 +1,65 @@
+from collections import OrderedDict
+import bpy
+
+
+# Bounded least-recently-used cache of the images loaded for review
+class ImageCache:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.images = OrderedDict()
+
+    def get_cached(self, file_name):
+        image = self.images.get(file_name)
+        if image is None:
+            return None
+
+        # The image may have been removed from bpy.data behind the cache's back
+        try:
+            image.name
+        except ReferenceError:
+            del self.images[file_name]
+            return None
+
+        self.images.move_to_end(file_name)
+        return image
+
+    def get(self, file_name, path, protected=()):
+        image = self.get_cached(file_name)
+        if image is None:
+            image = bpy.data.images.load(path, check_existing=True)
+            self.images[file_name] = image
+            self.evict(protected)
+        return image
+
+    def evict(self, protected=()):
+        for file_name in list(self.images):
+            if len(self.images) <= self.capacity:
+                break
+            if file_name in protected:
+                continue
+            self.discard(file_name)
+
+    def discard(self, file_name):
+        image = self.images.pop(file_name, None)
+        if image is None:
+            return
+
+        try:
+            bpy.data.images.remove(image)
+        except ReferenceError:
+            pass
+
+    def rename(self, file_name, new_file_name):
+        image = self.images.pop(file_name, None)
+        if image is not None:
+            self.images[new_file_name] = image
+
+    def clear(self):
+        for file_name in list(self.images):
+            self.discard(file_name)
+
+
+# Load an image and decode its pixels so that showing it later does not wait for the disk
+def decode_image(image):
+    if not image.has_data:
+        len(image.pixels)
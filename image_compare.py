@@ -0,0 +1,83 @@
+import os
+import bpy
+import numpy as np
+
+from .render_manifest import get_file_checksum
+
+
+INCREMENTAL_DIRECTORY_NAME = ".incremental"
+CHANGED_FILES_NAME = "changed_files.txt"
+
+
+# Read the pixels of an image file as a (height, width, 4) float array
+def load_image_pixels(path):
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        width, height = image.size
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)
+
+
+# Mean structural similarity of two single channel images over 8x8 pixel blocks
+def structural_similarity(a, b, block_size=8):
+    height = a.shape[0] // block_size * block_size
+    width = a.shape[1] // block_size * block_size
+    if height == 0 or width == 0:
+        return float(np.allclose(a, b))
+
+    shape = (height // block_size, block_size, width // block_size, block_size)
+    a = a[:height, :width].reshape(shape)
+    b = b[:height, :width].reshape(shape)
+
+    mean_a = a.mean(axis=(1, 3))
+    mean_b = b.mean(axis=(1, 3))
+    variance_a = a.var(axis=(1, 3))
+    variance_b = b.var(axis=(1, 3))
+    covariance = (a * b).mean(axis=(1, 3)) - mean_a * mean_b
+
+    c1 = 0.01 ** 2
+    c2 = 0.03 ** 2
+    ssim = ((2 * mean_a * mean_b + c1) * (2 * covariance + c2)) / \
+           ((mean_a ** 2 + mean_b ** 2 + c1) * (variance_a + variance_b + c2))
+    return float(ssim.mean())
+
+
+# Similarity of two image files between 0 and 1, comparing shading and silhouette
+def get_image_similarity(path_a, path_b):
+    pixels_a = load_image_pixels(path_a)
+    pixels_b = load_image_pixels(path_b)
+    if pixels_a.shape != pixels_b.shape:
+        return 0.0
+
+    luminance_a = pixels_a[..., :3] @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32) * pixels_a[..., 3]
+    luminance_b = pixels_b[..., :3] @ np.array([0.2126, 0.7152, 0.0722], dtype=np.float32) * pixels_b[..., 3]
+    return min(structural_similarity(luminance_a, luminance_b),
+               structural_similarity(pixels_a[..., 3], pixels_b[..., 3]))
+
+
+def images_match(new_path, old_path, min_similarity):
+    if os.path.getsize(new_path) == os.path.getsize(old_path) and get_file_checksum(new_path) == get_file_checksum(old_path):
+        return True
+    return get_image_similarity(new_path, old_path) >= min_similarity
+
+
+# Keep the existing image when the new render is not visibly different, otherwise replace it
+def publish_image(new_path, image_path, min_similarity):
+    if os.path.exists(image_path) and images_match(new_path, image_path, min_similarity):
+        os.remove(new_path)
+        return False
+
+    os.replace(new_path, image_path)
+    return True
+
+
+# Append the images a run changed to the changed files list. The render queue and batch render run the
+# renderer many times on one output directory, so every run adds its own section instead of replacing
+# the list. Each section starts with a "# run <run_id>" line and is written at once so runs don't interleave.
+def write_changed_files(output_directory, changed_files, run_id):
+    lines = [f"# run {run_id}"] + list(changed_files)
+    with open(os.path.join(output_directory, CHANGED_FILES_NAME), "a", encoding="utf-8") as changed_file:
+        changed_file.write("\n".join(lines) + "\n")
@@ -0,0 +1,156 @@
+import json
+import os
+import numpy as np
+
+
+HASHES_FILE_NAME = "image_hashes.json"
+DUPLICATES_FILE_NAME = "duplicates.json"
+DHASH_SIZE = 8
+PHASH_SIZE = 32
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+# Load an image scaled to width x height as luminance, composited over white so that
+# transparent and white backgrounds hash the same
+def load_luminance(path, width, height):
+    # Only decoding needs bpy, so hashes can be compared outside Blender
+    import bpy
+
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        image.scale(width, height)
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+
+    pixels = pixels.reshape(height, width, 4)
+    alpha = pixels[..., 3]
+    return (pixels[..., :3] @ LUMINANCE_WEIGHTS) * alpha + (1.0 - alpha)
+
+
+def bits_to_int(bits):
+    return int("".join("1" if bit else "0" for bit in bits.ravel()), 2)
+
+
+# Difference hash: whether each pixel is brighter than its right neighbour
+def get_dhash(luminance):
+    return bits_to_int(luminance[:, 1:] > luminance[:, :-1])
+
+
+def get_dct_matrix(size):
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.sqrt(2.0 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+DCT_MATRIX = get_dct_matrix(PHASH_SIZE)
+
+
+# Perceptual hash: whether each low-frequency DCT coefficient is above their median, leaving out the mean
+def get_phash(luminance):
+    coefficients = (DCT_MATRIX @ luminance @ DCT_MATRIX.T)[:DHASH_SIZE, :DHASH_SIZE].ravel()[1:]
+    return bits_to_int(coefficients > np.median(coefficients))
+
+
+def hash_image(path):
+    stat = os.stat(path)
+    return {
+        "dhash": get_dhash(load_luminance(path, DHASH_SIZE + 1, DHASH_SIZE)),
+        "phash": get_phash(load_luminance(path, PHASH_SIZE, PHASH_SIZE)),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+    }
+
+
+def is_hash_current(image_hash, path):
+    stat = os.stat(path)
+    return image_hash.get("size") == stat.st_size and image_hash.get("mtime") == stat.st_mtime
+
+
+def get_hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+# Metric tree of hashes under the Hamming distance. A search only descends into children whose
+# distance to their parent is within max_distance of the query's distance to the parent.
+class BKTree:
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, key):
+        if self.root is None:
+            self.root = (value, [key], {})
+            return
+
+        node = self.root
+        while True:
+            distance = get_hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, [key], {})
+                return
+            node = child
+
+    def search(self, value, max_distance):
+        found = []
+        nodes = [self.root] if self.root else []
+        while nodes:
+            node = nodes.pop()
+            distance = get_hamming_distance(value, node[0])
+            if distance <= max_distance:
+                found.extend(node[1])
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    nodes.append(child)
+        return found
+
+
+# Group images whose perceptual and difference hashes are both within max_distance of each other
+def find_duplicate_clusters(image_hashes, max_distance):
+    tree = BKTree()
+    for file_name, image_hash in image_hashes.items():
+        tree.add(image_hash["phash"], file_name)
+
+    parents = {file_name: file_name for file_name in image_hashes}
+
+    def find(file_name):
+        while parents[file_name] != file_name:
+            parents[file_name] = parents[parents[file_name]]
+            file_name = parents[file_name]
+        return file_name
+
+    for file_name, image_hash in image_hashes.items():
+        for other in tree.search(image_hash["phash"], max_distance):
+            if other != file_name and get_hamming_distance(image_hash["dhash"], image_hashes[other]["dhash"]) <= max_distance:
+                parents[find(other)] = find(file_name)
+
+    clusters = {}
+    for file_name in image_hashes:
+        clusters.setdefault(find(file_name), []).append(file_name)
+    return sorted((sorted(cluster) for cluster in clusters.values() if len(cluster) > 1), key=lambda c: (-len(c), c))
+
+
+def load_hashes(directory):
+    path = os.path.join(directory, HASHES_FILE_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as hashes_file:
+        return json.load(hashes_file)
+
+
+def save_hashes(directory, image_hashes):
+    with open(os.path.join(directory, HASHES_FILE_NAME), "w", encoding="utf-8") as hashes_file:
+        json.dump(image_hashes, hashes_file)
+
+
+def write_duplicates(directory, clusters, max_distance):
+    path = os.path.join(directory, DUPLICATES_FILE_NAME)
+    with open(path, "w", encoding="utf-8") as duplicates_file:
+        json.dump({"max_distance": max_distance, "clusters": clusters}, duplicates_file, indent=2)
+    return path
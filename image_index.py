@@ -0,0 +1,115 @@
+import bisect
+import os
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.webp')
+
+
+def is_image_file(file_name):
+    return file_name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+# Split an image file name like "Part_A_12iso_3.png" into its object name and step.
+# Picked images are renamed to the bare object name and have no step.
+def parse_image_name(file_name):
+    stem = os.path.splitext(file_name)[0]
+    object_name, separator, step = stem.rpartition("_")
+    if not separator or not step.isdigit():
+        return stem, None
+    return object_name, int(step)
+
+
+def get_image_sort_key(file_name):
+    step = parse_image_name(file_name)[1]
+    return (step is not None, step or 0, file_name)
+
+
+# Index of the images of a review folder by object, kept up to date on every change
+class ImageIndex:
+    def __init__(self, directory):
+        self.directory = directory
+        self.objects = []
+        self.object_positions = {}
+        self.positions_dirty = False
+        self.version = 0
+        self.object_images = {}
+        self.image_objects = {}
+        self.paths = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def add(self, path, keep_sorted=True):
+        file_name = os.path.basename(path)
+        if file_name in self.paths:
+            self.paths[file_name] = path
+            return False
+
+        object_name = parse_image_name(file_name)[0]
+        self.paths[file_name] = path
+        self.image_objects[file_name] = object_name
+
+        images = self.object_images.get(object_name)
+        if images is None:
+            images = self.object_images[object_name] = []
+            if keep_sorted:
+                bisect.insort(self.objects, object_name)
+            else:
+                self.objects.append(object_name)
+            self.positions_dirty = True
+            self.version += 1
+
+        sort_keys = [get_image_sort_key(image) for image in images]
+        images.insert(bisect.bisect(sort_keys, get_image_sort_key(file_name)), file_name)
+        return True
+
+    def remove(self, file_name):
+        object_name = self.image_objects.pop(file_name, None)
+        if object_name is None:
+            return
+
+        del self.paths[file_name]
+        images = self.object_images[object_name]
+        images.remove(file_name)
+        if not images:
+            del self.object_images[object_name]
+            del self.objects[bisect.bisect_left(self.objects, object_name)]
+            self.positions_dirty = True
+            self.version += 1
+
+    def rename(self, file_name, new_path):
+        self.remove(file_name)
+        self.add(new_path)
+
+    def get_object_position(self, object_name):
+        if self.positions_dirty:
+            self.object_positions = {name: position for position, name in enumerate(self.objects)}
+            self.positions_dirty = False
+        return self.object_positions[object_name]
+
+    def get_object_name(self, file_name):
+        return self.image_objects.get(file_name)
+
+    def get_images(self, object_name):
+        return self.object_images.get(object_name, [])
+
+    def get_path(self, file_name):
+        return self.paths.get(file_name)
+
+    # Get the image that is offset images away within the same object, wrapping around
+    def get_neighbor_image(self, file_name, offset):
+        images = self.object_images[self.image_objects[file_name]]
+        return images[(images.index(file_name) + offset) % len(images)]
+
+    # Get the name of the object that is offset objects away, wrapping around
+    def get_neighbor_object(self, object_name, offset):
+        position = self.get_object_position(object_name)
+        return self.objects[(position + offset) % len(self.objects)]
+
+
+def build_image_index(directory, image_paths):
+    index = ImageIndex(directory)
+    for path in image_paths:
+        index.add(path, keep_sorted=False)
+    index.objects.sort()
+    return index
@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import bpy
+import numpy as np
+
+
+SCORES_FILE_NAME = "scores.json"
+SCORE_IMAGE_SIZE = 256
+
+# Objects whose best image scores below LOW_CONFIDENCE_SCORE, or beats the runner-up by less
+# than LOW_CONFIDENCE_MARGIN, are left for manual review
+LOW_CONFIDENCE_SCORE = 0.4
+LOW_CONFIDENCE_MARGIN = 0.02
+
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+# Read the pixels of an image file downsampled to at most size pixels, as a (height, width, 4) array
+def load_scoring_pixels(path, size=SCORE_IMAGE_SIZE):
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        width, height = image.size
+        scale = min(1.0, size / max(width, height, 1))
+        if scale < 1.0:
+            width = max(1, int(width * scale))
+            height = max(1, int(height * scale))
+            image.scale(width, height)
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return pixels.reshape(height, width, 4)
+
+
+# Silhouette, framing, detail and contrast metrics of one image, vectorized over all pixels
+def compute_image_metrics(pixels):
+    alpha = pixels[..., 3]
+    luminance = pixels[..., :3] @ LUMINANCE_WEIGHTS
+
+    # Renders with a white background are opaque everywhere, so their silhouette is everything not white
+    if alpha.min() > 0.99:
+        mask = luminance < 0.97
+    else:
+        mask = alpha > 0.5
+
+    area = float(mask.mean())
+    if not mask.any():
+        return {"area": 0.0, "frame_coverage": 0.0, "fill_ratio": 0.0, "edge_density": 0.0, "contrast": 0.0}
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    columns = np.flatnonzero(mask.any(axis=0))
+    bbox_area = (rows[-1] - rows[0] + 1) * (columns[-1] - columns[0] + 1)
+
+    gradient_y = np.abs(np.diff(luminance, axis=0))[:, :-1]
+    gradient_x = np.abs(np.diff(luminance, axis=1))[:-1, :]
+    edges = (gradient_x + gradient_y) > 0.1
+    inner_mask = mask[:-1, :-1]
+
+    return {
+        "area": area,
+        "frame_coverage": float(bbox_area / mask.size),
+        "fill_ratio": float(mask.sum() / bbox_area),
+        "edge_density": float(edges[inner_mask].mean()) if inner_mask.any() else 0.0,
+        "contrast": float(luminance[mask].std()),
+    }
+
+
+# Combine the metrics into one score between 0 and 1
+def score_metrics(metrics):
+    return (0.35 * min(metrics["frame_coverage"] / 0.6, 1.0) +
+            0.25 * metrics["fill_ratio"] +
+            0.2 * min(metrics["edge_density"] / 0.1, 1.0) +
+            0.2 * min(metrics["contrast"] / 0.25, 1.0))
+
+
+def score_image(path):
+    stat = os.stat(path)
+    metrics = compute_image_metrics(load_scoring_pixels(path))
+    return dict(metrics, score=score_metrics(metrics), size=stat.st_size, mtime=stat.st_mtime)
+
+
+def score_images(paths):
+    return {os.path.basename(path): score_image(path) for path in paths}
+
+
+# Reuse the scores of images that have not changed since they were scored
+def is_score_current(score, path):
+    stat = os.stat(path)
+    return score.get("size") == stat.st_size and score.get("mtime") == stat.st_mtime
+
+
+# Pick the best image of every object and flag objects whose best image is not clearly better
+def select_best_images(object_images, image_scores):
+    selections = {}
+    for object_name, images in object_images.items():
+        scored = sorted((image_scores[image]["score"], image) for image in images if image in image_scores)
+        if not scored:
+            continue
+
+        best_score, best_image = scored[-1]
+        margin = best_score - scored[-2][0] if len(scored) > 1 else 1.0
+        selections[object_name] = {
+            "best": best_image,
+            "score": best_score,
+            "margin": margin,
+            "low_confidence": best_score < LOW_CONFIDENCE_SCORE or margin < LOW_CONFIDENCE_MARGIN,
+        }
+    return selections
+
+
+def load_scores(directory):
+    path = os.path.join(directory, SCORES_FILE_NAME)
+    if not os.path.exists(path):
+        return {"images": {}, "objects": {}}
+    with open(path, encoding="utf-8") as scores_file:
+        return json.load(scores_file)
+
+
+def save_scores(directory, scores):
+    with open(os.path.join(directory, SCORES_FILE_NAME), "w", encoding="utf-8") as scores_file:
+        json.dump(scores, scores_file)
+
+
+# Worker mode: blender --background --python image_scoring.py -- paths.json scores.json
+def main():
+    paths_path, output_path = sys.argv[sys.argv.index("--") + 1:][:2]
+    with open(paths_path, encoding="utf-8") as paths_file:
+        paths = json.load(paths_file)
+    with open(output_path, "w", encoding="utf-8") as output_file:
+        json.dump(score_images(paths), output_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,274 @@ bl_info = {
 }
 
 import bpy
+import bisect
+import json
 import os
-import shutil
-from bpy.props import StringProperty
-from bpy.types import Operator, Panel
+import re
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bpy.props import BoolProperty, CollectionProperty, FloatProperty, IntProperty, StringProperty
+from bpy.types import Operator, Panel, PropertyGroup, UIList
+
+from .batch_render import run_background_blender
+from .contact_sheet import get_contact_sheet, get_tile_at
+from .folder_watcher import FolderWatcher
+from .image_cache import ImageCache, decode_image
+from .image_hashing import find_duplicate_clusters, hash_image, is_hash_current, load_hashes, save_hashes, write_duplicates
+from .image_index import build_image_index, parse_image_name
+from .image_scoring import is_score_current, load_scores, save_scores, score_images, select_best_images
+from .import_package import ImportPackage
+from .media_workbook import get_manifest_product_images, get_picked_product_images, write_media_workbook
+from .output_formats import is_extra_format_path
+from .pick_journal import PickJournal, is_omitted_path
+from .render_manifest import open_existing_manifest
+
+
+# Index of the open images folder, built once when the folder is opened
+image_index = None
+
+# Image scores and the pre-selected best image of each object, read from the folder's scores file
+image_scores = {"images": {}, "objects": {}}
+
+# Picks of the open images folder, recorded in its journal until they are committed
+pick_journal = None
+
+# Watcher adding new images of the open folder to its index while a render is still running
+folder_watcher = None
+
+# The index and index version the object browser list was last filled from, and the object names it holds
+object_list_state = {"index": None, "version": None, "names": []}
+
+# Filter results of the object browser, reused until the filter or the review state changes
+object_filter_cache = {"key": None, "flags": []}
+
+# Images are only loaded when they are shown and a bounded number of them is kept loaded
+image_cache = ImageCache()
+
+# Keymap items added by this add-on, removed again on unregister
+addon_keymaps = []
+
+# The contact sheet shown in the image editor and the images of its tiles
+contact_sheet_state = {"image_name": None, "object_name": None, "images": []}
+
+
+# List the image files of a folder, using the renderer's manifest instead of a directory scan when available.
+# The scan goes into shard folders like the folder watcher does, skipping omitted images and extra formats.
+def list_image_files(directory):
+    manifest = open_existing_manifest(directory)
+    if manifest:
+        try:
+            return [path for path in manifest.image_paths()
+                    if not is_extra_format_path(os.path.relpath(path, directory)) and os.path.exists(path)]
+        finally:
+            manifest.close()
+
+    found = {}
+    FolderWatcher(directory).scan("", found)
+    return [os.path.join(directory, relative_path) for relative_path in sorted(found)]
+
+
+# Get the index of the current images folder, building it if the folder changed
+def get_image_index(context):
+    global image_index, image_scores, pick_journal
+    directory = bpy.path.abspath(context.scene.select_best_image_directory)
+    if image_index is None or image_index.directory != directory:
+        image_index = build_image_index(directory, list_image_files(directory)) if os.path.isdir(directory) else None
+        image_scores = load_scores(directory) if image_index else {"images": {}, "objects": {}}
+        pick_journal = PickJournal(directory) if image_index else None
+    return image_index
+
+
+# Get the import package that committed picks are added to, if one is set
+def get_package_path(context):
+    package_path = context.scene.select_best_image_package_path
+    return bpy.path.abspath(package_path) if package_path else None
+
+
+# The image shown first for an object: its picked image, its pre-selected best image if it was scored,
+# otherwise its first image
+def get_first_image(index, object_name):
+    picked_image = pick_journal.get_pick(object_name) if pick_journal else None
+    if picked_image and index.get_object_name(picked_image) == object_name:
+        return picked_image
+
+    selection = image_scores["objects"].get(object_name)
+    if selection and index.get_object_name(selection["best"]) == object_name:
+        return selection["best"]
+    return index.get_images(object_name)[0]
+
+
+# Score images in background Blenders, since decoding images needs bpy, splitting them evenly over the workers
+def score_images_in_background(paths, workers):
+    chunks = [paths[i::workers] for i in range(workers)]
+    with tempfile.TemporaryDirectory() as temp_directory:
+        def score_chunk(chunk_index):
+            paths_path = os.path.join(temp_directory, f"paths_{chunk_index}.json")
+            output_path = os.path.join(temp_directory, f"scores_{chunk_index}.json")
+            with open(paths_path, "w", encoding="utf-8") as paths_file:
+                json.dump(chunks[chunk_index], paths_file)
+
+            result = run_background_blender(None, (paths_path, output_path), threads=1,
+                                            python_file=os.path.join(os.path.dirname(__file__), "image_scoring.py"))
+            if result.returncode != 0:
+                raise RuntimeError(result.stdout.strip().splitlines()[-1] if result.stdout.strip() else "Scoring failed")
+            with open(output_path, encoding="utf-8") as output_file:
+                return json.load(output_file)
+
+        scores = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_scores in executor.map(score_chunk, range(workers)):
+                scores.update(chunk_scores)
+    return scores
+
+
+# Record the pick of an image in the journal, with the paths of all images of its object
+def record_pick(index, object_name, file_name):
+    paths = [index.get_path(image) for image in index.get_images(object_name)]
+    pick_journal.record_pick(object_name, index.get_path(file_name), paths)
+
+
+# Update the index and the loaded images after files of the images folder were moved.
+# Moves are paths relative to the images folder, and images are indexed and cached by file name.
+def update_index_after_moves(index, moves):
+    for source, destination in moves:
+        file_name = os.path.basename(source)
+        if not is_omitted_path(source):
+            index.remove(file_name)
+        if is_omitted_path(destination):
+            image_cache.discard(file_name)
+            continue
+
+        path = os.path.join(index.directory, destination)
+        index.add(path)
+        image = image_cache.get_cached(file_name)
+        if image is not None:
+            image.filepath = path
+            image_cache.rename(file_name, os.path.basename(destination))
+
+
+# Add the images that finished rendering into the watched folder to the index, every watch interval
+def watch_images_folder():
+    global folder_watcher
+    watcher = folder_watcher
+    if watcher is None:
+        return None
+    if image_index is None or image_index.directory != watcher.directory:
+        folder_watcher = None
+        return None
+
+    try:
+        new_paths = watcher.poll()
+    except OSError as e:
+        print(f"Could not watch the images folder: {e}")
+        new_paths = []
+
+    for path in new_paths:
+        image_index.add(path)
+    if new_paths:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'IMAGE_EDITOR':
+                    area.tag_redraw()
+
+    return bpy.context.scene.select_best_image_watch_interval
+
+
+def stop_watching_images_folder():
+    global folder_watcher
+    folder_watcher = None
+    if bpy.app.timers.is_registered(watch_images_folder):
+        bpy.app.timers.unregister(watch_images_folder)
+
+
+# Keep the render manifest in step with picked images that were renamed, or renamed back by an undo,
+# so that they are still listed when the folder is opened again
+def update_manifest_after_moves(directory, moves):
+    renames = [(source, destination) for source, destination in moves
+               if not is_omitted_path(source) and not is_omitted_path(destination)]
+    if not renames:
+        return
+
+    try:
+        manifest = open_existing_manifest(directory)
+        if manifest:
+            try:
+                for source, destination in renames:
+                    manifest.move_image(source, destination)
+            finally:
+                manifest.close()
+    except sqlite3.Error as e:
+        print(f"Could not update the render manifest: {e}")
+
+
+# Show the first image of an object after the index changed, falling back to the first object
+def show_object(context, index, object_name):
+    if not index.objects or not context.space_data or context.space_data.type != 'IMAGE_EDITOR':
+        return
+    if object_name not in index.object_images:
+        object_name = index.objects[0]
+    show_image(context, index, get_first_image(index, object_name))
+
+
+def get_image_file_name(image):
+    if image.filepath:
+        return os.path.basename(bpy.path.abspath(image.filepath))
+    return image.name
+
+
+# Show an indexed image in the image editor and prefetch its neighbours
+def show_image(context, index, file_name):
+    image_cache.capacity = context.scene.select_best_image_cache_size
+    context.space_data.image = image_cache.get(file_name, index.get_path(file_name), protected={file_name})
+
+    object_name = index.get_object_name(file_name)
+    neighbors = [
+        index.get_neighbor_image(file_name, 1),
+        index.get_neighbor_image(file_name, -1),
+        index.get_images(index.get_neighbor_object(object_name, 1))[0],
+        index.get_images(index.get_neighbor_object(object_name, -1))[0],
+    ]
+    bpy.app.timers.register(lambda: prefetch_images(index, file_name, neighbors), first_interval=0.05)
+
+
+# Load and decode neighbouring images after the current one has been drawn
+def prefetch_images(index, current_file_name, file_names):
+    if index is not image_index:
+        return None
+
+    protected = set(file_names) | {current_file_name}
+    for file_name in file_names:
+        path = index.get_path(file_name)
+        if path:
+            decode_image(image_cache.get(file_name, path, protected))
+    return None
+
+
+def is_showing_contact_sheet(context):
+    current_image = context.space_data.image
+    return bool(current_image) and current_image.name == contact_sheet_state["image_name"]
+
+
+# Get the index and the file name of the image shown in the image editor, if it is indexed.
+# While a contact sheet is shown, its first image stands in for the current image.
+def get_current_image(context):
+    current_image = context.space_data.image
+    if not current_image:
+        return None, None
+
+    index = get_image_index(context)
+    if is_showing_contact_sheet(context):
+        images = contact_sheet_state["images"]
+        if index is None or not images or index.get_object_name(images[0]) is None:
+            return None, None
+        return index, images[0]
+
+    file_name = get_image_file_name(current_image)
+    if index is None or index.get_object_name(file_name) is None:
+        return None, None
+    return index, file_name
 
 class OBJECT_OT_select_best_image(Operator):
     bl_idname = "object.select_best_image"
@@ -22,18 +286,199 @@ class OBJECT_OT_select_best_image(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        directory = context.scene.select_best_image_directory
+        global image_index, image_scores, pick_journal
+        directory = bpy.path.abspath(context.scene.select_best_image_directory)
 
         if not os.path.exists(directory):
             self.report({'ERROR'}, "Invalid directory path")
             return {'CANCELLED'}
 
-        image_files = [f for f in os.listdir(directory) if f.lower().endswith(('.png', '.jpg', '.tiff'))]
+        image_cache.clear()
+        image_index = build_image_index(directory, list_image_files(directory))
+        image_scores = load_scores(directory)
+        pick_journal = PickJournal(directory)
+
+        if image_index.objects and context.space_data and context.space_data.type == 'IMAGE_EDITOR':
+            show_image(context, image_index, get_first_image(image_index, image_index.objects[0]))
+
+        self.report({'INFO'}, f"Found {len(image_index)} images of {len(image_index.objects)} objects")
+        return {'FINISHED'}
+
+# Get the file name of the committed pick of an object. Committed picks are renamed to the object name,
+# which has no step and sorts before the object's other images.
+def get_committed_pick(index, object_name):
+    images = index.get_images(object_name)
+    if images and parse_image_name(images[0])[1] is None:
+        return images[0]
+    return None
+
+
+# An object is reviewed once it has a pending or a committed pick
+def is_object_reviewed(index, object_name):
+    if pick_journal and pick_journal.get_pick(object_name):
+        return True
+    return get_committed_pick(index, object_name) is not None
+
+
+def is_object_low_score(object_name):
+    selection = image_scores["objects"].get(object_name)
+    return bool(selection and selection["low_confidence"])
+
+
+# Fill the object browser list from the index, keeping the active object selected.
+# Runs from a timer since panels may not change properties while they are drawn.
+def sync_object_list():
+    window_manager = bpy.context.window_manager
+    objects = window_manager.select_best_image_objects
+    position = window_manager.select_best_image_active_object
+    active_name = objects[position].name if 0 <= position < len(objects) else None
+
+    index = image_index
+    if index is not None and object_list_state["index"] is index and len(objects) == len(object_list_state["names"]):
+        update_object_list(objects, object_list_state["names"], index.objects)
+    else:
+        objects.clear()
+        object_list_state["names"] = []
+        if index is not None:
+            for object_name in index.objects:
+                objects.add().name = object_name
+            object_list_state["names"] = list(index.objects)
+
+    object_list_state["index"] = index
+    object_list_state["version"] = index.version if index is not None else None
+
+    new_position = index.get_object_position(active_name) if index is not None and active_name in index.object_images else 0
+    if new_position != position:
+        window_manager.select_best_image_active_object = new_position
+    return None
+
+
+# Bring the list up to date with the index's sorted object names by only removing and inserting the objects
+# that changed, since the folder watcher adds objects to large folders while they are reviewed
+def update_object_list(objects, listed_names, object_names):
+    listed = set(listed_names)
+    current = set(object_names)
+    for object_name in listed - current:
+        position = bisect.bisect_left(listed_names, object_name)
+        objects.remove(position)
+        del listed_names[position]
+
+    for object_name in sorted(current - listed):
+        position = bisect.bisect(listed_names, object_name)
+        objects.add().name = object_name
+        objects.move(len(objects) - 1, position)
+        listed_names.insert(position, object_name)
+
+
+def request_object_list_sync():
+    if not bpy.app.timers.is_registered(sync_object_list):
+        bpy.app.timers.register(sync_object_list, first_interval=0.0)
+
+class SelectBestImageObject(PropertyGroup):
+    pass
+
+def show_selected_object(self, context):
+    index = image_index
+    objects = context.window_manager.select_best_image_objects
+    position = context.window_manager.select_best_image_active_object
+    if index is None or not 0 <= position < len(objects) or not context.space_data:
+        return
+
+    object_name = objects[position].name
+    if object_name in index.object_images and context.space_data.type == 'IMAGE_EDITOR':
+        show_image(context, index, get_first_image(index, object_name))
+
+class IMAGE_UL_select_best_image_objects(UIList):
+    use_filter_regex: BoolProperty(
+        name="Regular Expression",
+        description="Filter object names with a regular expression instead of a name prefix",
+        default=False,
+    )
+    use_filter_unreviewed: BoolProperty(
+        name="Unreviewed Only",
+        description="Only show objects without a picked image",
+        default=False,
+    )
+    use_filter_low_score: BoolProperty(
+        name="Low Score Only",
+        description="Only show objects whose best image was scored with low confidence",
+        default=False,
+    )
+
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+        if image_index is not None and item.name in image_index.object_images and is_object_reviewed(image_index, item.name):
+            icon = 'CHECKMARK'
+        elif is_object_low_score(item.name):
+            icon = 'ERROR'
+        else:
+            icon = 'BLANK1'
+        layout.label(text=item.name, icon=icon)
+
+    def draw_filter(self, context, layout):
+        row = layout.row(align=True)
+        row.prop(self, "filter_name", text="")
+        row.prop(self, "use_filter_regex", text="", icon='SORTBYEXT')
+        row = layout.row(align=True)
+        row.prop(self, "use_filter_unreviewed", toggle=True)
+        row.prop(self, "use_filter_low_score", toggle=True)
+
+    # The list is already sorted by name, so only the filter flags are computed, once per filter and review state
+    def filter_items(self, context, data, propname):
+        objects = getattr(data, propname)
+        journal_state = (len(pick_journal.pending), len(pick_journal.commits)) if pick_journal else None
+        key = (self.filter_name, self.use_filter_regex, self.use_filter_unreviewed, self.use_filter_low_score,
+               len(objects), object_list_state["version"], id(object_list_state["index"]), journal_state,
+               id(image_scores))
+        if object_filter_cache["key"] == key:
+            return object_filter_cache["flags"], []
+
+        if self.filter_name and self.use_filter_regex:
+            try:
+                pattern = re.compile(self.filter_name, re.IGNORECASE)
+                matches_name = lambda name: pattern.search(name) is not None
+            except re.error:
+                matches_name = lambda name: False
+        elif self.filter_name:
+            prefix = self.filter_name.lower()
+            matches_name = lambda name: name.lower().startswith(prefix)
+        else:
+            matches_name = lambda name: True
+
+        index = object_list_state["index"]
+        flags = []
+        for item in objects:
+            name = item.name
+            visible = matches_name(name)
+            if visible and self.use_filter_unreviewed and index is not None and name in index.object_images:
+                visible = not is_object_reviewed(index, name)
+            if visible and self.use_filter_low_score:
+                visible = is_object_low_score(name)
+            flags.append(self.bitflag_filter_item if visible else 0)
+
+        object_filter_cache["key"] = key
+        object_filter_cache["flags"] = flags
+        return flags, []
 
-        for image in image_files:
-            img_path = os.path.join(directory, image)
-            bpy.ops.image.open(filepath=img_path)
+class OBJECT_OT_watch_images_folder(Operator):
+    bl_idname = "object.watch_images_folder"
+    bl_label = "Watch Images Folder"
+    bl_description = "Add images to the review as they are rendered into the images folder"
 
+    def execute(self, context):
+        global folder_watcher
+        if folder_watcher is not None:
+            stop_watching_images_folder()
+            self.report({'INFO'}, "Stopped watching the images folder")
+            return {'FINISHED'}
+
+        index = get_image_index(context)
+        if index is None:
+            self.report({'ERROR'}, "Invalid directory path")
+            return {'CANCELLED'}
+
+        folder_watcher = FolderWatcher(index.directory, index.paths.values())
+        bpy.app.timers.register(watch_images_folder)
+        self.report({'INFO'}, "Watching the images folder for new images")
         return {'FINISHED'}
 
 class OBJECT_OT_next_image(Operator):
@@ -42,16 +487,9 @@ class OBJECT_OT_next_image(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        images = bpy.data.images
-        if len(images) > 0:
-            current_image = context.space_data.image
-            if current_image:
-                object_name = current_image.name.split('_')[0]
-                object_images = [img for img in images if img.name.startswith(object_name + "_")]
-
-                index = object_images.index(current_image)
-                index = (index + 1) % len(object_images)
-                context.space_data.image = object_images[index]
+        index, file_name = get_current_image(context)
+        if index:
+            show_image(context, index, index.get_neighbor_image(file_name, 1))
 
         return {'FINISHED'}
 
@@ -61,16 +499,9 @@ class OBJECT_OT_previous_image(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        images = bpy.data.images
-        if len(images) > 0:
-            current_image = context.space_data.image
-            if current_image:
-                object_name = current_image.name.split('_')[0]
-                object_images = [img for img in images if img.name.startswith(object_name + "_")]
-
-                index = object_images.index(current_image)
-                index = (index - 1) % len(object_images)
-                context.space_data.image = object_images[index]
+        index, file_name = get_current_image(context)
+        if index:
+            show_image(context, index, index.get_neighbor_image(file_name, -1))
 
         return {'FINISHED'}
 
@@ -80,21 +511,10 @@ class OBJECT_OT_next_object(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        images = bpy.data.images
-        if len(images) > 0:
-            current_image = context.space_data.image
-            if current_image:
-                object_names = sorted(set(img.name.split('_')[0] for img in images))
-                current_object_name = current_image.name.split('_')[0]
-
-                index = object_names.index(current_object_name)
-                index = (index + 1) % len(object_names)
-                next_object_name = object_names[index]
-
-                next_object_images = [img for img in images if img.name.startswith(next_object_name + "_")]
-
-                if next_object_images:
-                    context.space_data.image = next_object_images[0]
+        index, file_name = get_current_image(context)
+        if index:
+            next_object_name = index.get_neighbor_object(index.get_object_name(file_name), 1)
+            show_image(context, index, get_first_image(index, next_object_name))
 
         return {'FINISHED'}
 
@@ -104,21 +524,10 @@ class OBJECT_OT_previous_object(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        images = bpy.data.images
-        if len(images) > 0:
-            current_image = context.space_data.image
-            if current_image:
-                object_names = sorted(set(img.name.split('_')[0] for img in images))
-                current_object_name = current_image.name.split('_')[0]
-
-                index = object_names.index(current_object_name)
-                index = (index - 1) % len(object_names)
-                prev_object_name = object_names[index]
-
-                prev_object_images = [img for img in images if img.name.startswith(prev_object_name + "_")]
-
-                if prev_object_images:
-                    context.space_data.image = prev_object_images[0]
+        index, file_name = get_current_image(context)
+        if index:
+            prev_object_name = index.get_neighbor_object(index.get_object_name(file_name), -1)
+            show_image(context, index, get_first_image(index, prev_object_name))
 
         return {'FINISHED'}
 
@@ -136,26 +545,341 @@ class OBJECT_OT_pick_this_image(Operator):
             self.report({'ERROR'}, "No image selected")
             return {'CANCELLED'}
 
-        directory = context.scene.select_best_image_directory
-        omitted_directory = os.path.join(directory, "Omitted")
-        os.makedirs(omitted_directory, exist_ok=True)
+        if is_showing_contact_sheet(context):
+            self.report({'ERROR'}, "Double-click a tile of the contact sheet to pick it")
+            return {'CANCELLED'}
+
+        index, file_name = get_current_image(context)
+        if not index:
+            self.report({'ERROR'}, "Image is not part of the images folder")
+            return {'CANCELLED'}
 
-        object_name = current_image.name.split('_')[0]
+        object_name = index.get_object_name(file_name)
+        record_pick(index, object_name, file_name)
 
-        image_files = [f for f in os.listdir(directory) if f.lower().endswith(('.png', '.jpg', '.tiff'))]
+        self.report({'INFO'}, f"Picked {file_name}, {len(pick_journal.pending)} picks to commit")
+        return {'FINISHED'}
+
+class OBJECT_OT_find_duplicate_images(Operator):
+    bl_idname = "object.find_duplicate_images"
+    bl_label = "Find Duplicate Images"
+    bl_description = "Find picked images of different objects that look nearly the same"
 
-        for image in image_files:
-            if image.startswith(object_name + "_"):
-                img_path = os.path.join(directory, image)
-                if image != current_image.name:
-                    shutil.move(img_path, os.path.join(omitted_directory, image))
-                    bpy.data.images.remove(bpy.data.images[image])
-                else:
-                    new_img_path = os.path.join(directory, object_name + os.path.splitext(image)[1])
-                    os.rename(img_path, new_img_path)
+    max_distance: IntProperty(
+        name="Max Distance",
+        description="Number of the 64 hash bits in which near-duplicate images may differ",
+        default=6,
+        min=0,
+        max=32,
+    )
 
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        index = get_image_index(context)
+        if index is None:
+            self.report({'ERROR'}, "Invalid directory path")
+            return {'CANCELLED'}
+
+        picked_images = []
+        for object_name in index.objects:
+            picked_image = pick_journal.get_pick(object_name) or get_committed_pick(index, object_name)
+            if picked_image is not None and index.get_path(picked_image):
+                picked_images.append(picked_image)
+
+        cached_hashes = load_hashes(index.directory)
+        image_hashes = {}
+        for file_name in picked_images:
+            path = index.get_path(file_name)
+            image_hash = cached_hashes.get(file_name)
+            image_hashes[file_name] = image_hash if image_hash and is_hash_current(image_hash, path) else hash_image(path)
+        save_hashes(index.directory, dict(cached_hashes, **image_hashes))
+
+        clusters = find_duplicate_clusters(image_hashes, self.max_distance)
+        path = write_duplicates(index.directory, clusters, self.max_distance)
+        self.report({'INFO'}, f"Found {len(clusters)} groups of near-duplicate images among {len(picked_images)} "
+                              f"picked images, see {os.path.basename(path)}")
+        return {'FINISHED'}
+
+class OBJECT_OT_export_media_workbook(Operator):
+    bl_idname = "object.export_media_workbook"
+    bl_label = "Export Media Workbook"
+    bl_description = ("Write a media import workbook with the committed picks of the images folder, "
+                      "or with the rendered images of its manifest when nothing was picked")
+
+    def execute(self, context):
+        index = get_image_index(context)
+        if index is None:
+            self.report({'ERROR'}, "Invalid directory path")
+            return {'CANCELLED'}
+
+        output_path = bpy.path.abspath(context.scene.select_best_image_workbook_path)
+        if not output_path:
+            output_path = os.path.join(index.directory, "Media Import.xlsx")
+
+        start_time = time.perf_counter()
+        manifest = None
+        if any(get_committed_pick(index, object_name) for object_name in index.objects):
+            product_images = get_picked_product_images(index.objects, lambda name: get_committed_pick(index, name))
+        else:
+            manifest = open_existing_manifest(index.directory)
+            if manifest is None:
+                self.report({'ERROR'}, "No committed picks and no render manifest in the images folder")
+                return {'CANCELLED'}
+            product_images = get_manifest_product_images(manifest)
+
+        try:
+            product_count = write_media_workbook(output_path, product_images)
+        except (OSError, KeyError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not write the media workbook: {e}")
+            return {'CANCELLED'}
+        finally:
+            if manifest:
+                manifest.close()
+
+        self.report({'INFO'}, f"Wrote {product_count} products to {os.path.basename(output_path)} "
+                              f"in {time.perf_counter() - start_time:.1f} s")
+        return {'FINISHED'}
+
+class OBJECT_OT_export_import_package(Operator):
+    bl_idname = "object.export_import_package"
+    bl_label = "Export Import Package"
+    bl_description = "Add all committed picks and a media workbook to the import package"
+
+    def execute(self, context):
+        index = get_image_index(context)
+        package_path = get_package_path(context)
+        if index is None or not package_path:
+            self.report({'ERROR'}, "Set the images folder and the package file")
+            return {'CANCELLED'}
+
+        picks = {object_name: get_committed_pick(index, object_name) for object_name in index.objects}
+        picks = {object_name: file_name for object_name, file_name in picks.items() if file_name}
+        if not picks:
+            self.report({'ERROR'}, "No committed picks to package")
+            return {'CANCELLED'}
+
+        start_time = time.perf_counter()
+        try:
+            package = ImportPackage(package_path)
+            package.add_images([index.get_path(file_name) for file_name in picks.values()])
+            with tempfile.TemporaryDirectory() as temp_directory:
+                workbook_path = os.path.join(temp_directory, "Media Import.xlsx")
+                write_media_workbook(workbook_path, get_picked_product_images(index.objects, picks.get))
+                file_count = package.finalize(workbook_path)
+        except (OSError, KeyError, ValueError) as e:
+            self.report({'ERROR'}, f"Could not write the import package: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Packaged {file_count} files in {time.perf_counter() - start_time:.1f} s")
+        return {'FINISHED'}
+
+class OBJECT_OT_commit_picks(Operator):
+    bl_idname = "object.commit_picks"
+    bl_label = "Commit Picks"
+    bl_description = "Move the images that were not picked to the Omitted folder and rename the picked images"
+    bl_options = {'REGISTER'}
+
+    dry_run: BoolProperty(
+        name="Dry Run",
+        description="Only list the file moves in the console",
+        default=False,
+    )
+    workers: IntProperty(
+        name="Workers",
+        description="Number of file moves run at the same time",
+        default=8,
+        min=1,
+        max=64,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        index = get_image_index(context)
+        if index is None or not pick_journal.pending:
+            self.report({'ERROR'}, "No picks to commit")
+            return {'CANCELLED'}
+
+        if self.dry_run:
+            planned = pick_journal.plan_moves()
+            for object_name, moves in planned.items():
+                for source, destination in moves:
+                    print(f"{object_name}: {source} -> {destination}")
+            self.report({'INFO'}, f"{sum(len(moves) for moves in planned.values())} files of {len(planned)} objects would be moved")
+            return {'FINISHED'}
+
+        current_index, current_file_name = get_current_image(context)
+        object_name = index.get_object_name(current_file_name) if current_index else None
+
+        done, errors = pick_journal.commit(self.workers)
+        update_index_after_moves(index, done)
+        update_manifest_after_moves(index.directory, done)
+        show_object(context, index, object_name)
+
+        # Picked images are added to the import package as soon as their pick is committed
+        package_path = get_package_path(context)
+        if package_path:
+            picked_paths = [index.get_path(os.path.basename(destination)) for source, destination in done
+                            if not is_omitted_path(destination) and index.get_path(os.path.basename(destination))]
+            try:
+                ImportPackage(package_path).add_images(picked_paths)
+            except OSError as e:
+                errors.append(f"{os.path.basename(package_path)}: {e}")
+
+        if errors:
+            for error in errors:
+                print(error)
+            self.report({'WARNING'}, f"Moved {len(done)} files, {len(errors)} moves failed, see the console")
+        else:
+            self.report({'INFO'}, f"Moved {len(done)} files")
+        return {'FINISHED'}
+
+class OBJECT_OT_undo_pick_commit(Operator):
+    bl_idname = "object.undo_pick_commit"
+    bl_label = "Undo Last Commit"
+    bl_description = "Move the files of the last commit back and make its picks pending again"
+    bl_options = {'REGISTER'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        index = get_image_index(context)
+        if index is None or not pick_journal.commits:
+            self.report({'ERROR'}, "No commit to undo")
+            return {'CANCELLED'}
+
+        current_index, current_file_name = get_current_image(context)
+        object_name = index.get_object_name(current_file_name) if current_index else None
+
+        done, errors = pick_journal.undo()
+        update_index_after_moves(index, done)
+        update_manifest_after_moves(index.directory, done)
+        show_object(context, index, object_name)
+
+        if errors:
+            for error in errors:
+                print(error)
+            self.report({'WARNING'}, f"Moved {len(done)} files back, {len(errors)} moves failed, see the console")
+        else:
+            self.report({'INFO'}, f"Moved {len(done)} files back")
+        return {'FINISHED'}
+
+class OBJECT_OT_score_images(Operator):
+    bl_idname = "object.score_images"
+    bl_label = "Score Images"
+    bl_description = "Score every image and pre-select the best image of each object"
+
+    def execute(self, context):
+        global image_scores
+        index = get_image_index(context)
+        if index is None:
+            self.report({'ERROR'}, "Invalid directory path")
+            return {'CANCELLED'}
+
+        scores = load_scores(index.directory)
+        pending = [path for file_name, path in index.paths.items()
+                   if file_name not in scores["images"] or not is_score_current(scores["images"][file_name], path)]
+
+        workers = min(context.scene.select_best_image_score_workers, len(pending))
+        try:
+            if workers > 1:
+                scores["images"].update(score_images_in_background(pending, workers))
+            else:
+                scores["images"].update(score_images(pending))
+        except (OSError, RuntimeError) as e:
+            self.report({'ERROR'}, f"Scoring failed: {e}")
+            return {'CANCELLED'}
+
+        scores["images"] = {file_name: score for file_name, score in scores["images"].items() if file_name in index.paths}
+        scores["objects"] = select_best_images(index.object_images, scores["images"])
+        save_scores(index.directory, scores)
+        image_scores = scores
+
+        low_confidence = sum(1 for selection in scores["objects"].values() if selection["low_confidence"])
+        self.report({'INFO'}, f"Scored {len(pending)} images, {low_confidence} of {len(scores['objects'])} objects need review")
+        return {'FINISHED'}
+
+class OBJECT_OT_pick_best_images(Operator):
+    bl_idname = "object.pick_best_images"
+    bl_label = "Pick Best Images"
+    bl_description = "Pick the pre-selected best image of every object that does not need review"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+    def execute(self, context):
+        index = get_image_index(context)
+        if index is None:
+            self.report({'ERROR'}, "Invalid directory path")
+            return {'CANCELLED'}
+
+        picked = 0
+        for object_name, selection in image_scores["objects"].items():
+            if selection["low_confidence"] or object_name in pick_journal.pending:
+                continue
+            if index.get_object_name(selection["best"]) != object_name:
+                continue
+            record_pick(index, object_name, selection["best"])
+            picked += 1
+
+        self.report({'INFO'}, f"Picked the best image of {picked} objects, {len(pick_journal.pending)} picks to commit")
         return {'FINISHED'}
 
+class OBJECT_OT_show_contact_sheet(Operator):
+    bl_idname = "object.show_contact_sheet"
+    bl_label = "Show Contact Sheet"
+    bl_description = "Show all images of the current object side by side"
+
+    def execute(self, context):
+        index, file_name = get_current_image(context)
+        if not index:
+            self.report({'ERROR'}, "No image selected")
+            return {'CANCELLED'}
+
+        object_name = index.get_object_name(file_name)
+        images = list(index.get_images(object_name))
+        sheet = get_contact_sheet(index.directory, object_name, [index.get_path(image) for image in images],
+                                  context.scene.select_best_image_tile_size)
+
+        # Only the shown contact sheet is kept loaded, the previous one is removed once it is replaced
+        previous_sheet = bpy.data.images.get(contact_sheet_state["image_name"] or "")
+        contact_sheet_state["image_name"] = sheet.name
+        contact_sheet_state["object_name"] = object_name
+        contact_sheet_state["images"] = images
+        context.space_data.image = sheet
+        if previous_sheet is not None and previous_sheet != sheet:
+            bpy.data.images.remove(previous_sheet)
+
+        return {'FINISHED'}
+
+class OBJECT_OT_pick_contact_sheet_tile(Operator):
+    bl_idname = "object.pick_contact_sheet_tile"
+    bl_label = "Pick Contact Sheet Tile"
+    bl_description = "Pick the image of the contact sheet tile under the mouse"
+
+    @classmethod
+    def poll(cls, context):
+        return context.space_data and context.space_data.type == 'IMAGE_EDITOR' and is_showing_contact_sheet(context)
+
+    def invoke(self, context, event):
+        u, v = context.region.view2d.region_to_view(event.mouse_region_x, event.mouse_region_y)
+        images = contact_sheet_state["images"]
+        tile = get_tile_at(u, v, len(images))
+        index = get_image_index(context)
+        if tile is None or index is None or index.get_path(images[tile]) is None:
+            return {'PASS_THROUGH'}
+
+        show_image(context, index, images[tile])
+        return bpy.ops.object.pick_this_image('INVOKE_DEFAULT')
+
+    def execute(self, context):
+        return {'CANCELLED'}
+
 class IMAGE_PT_select_best_image(Panel):
     bl_label = "Select Best Object Image"
     bl_idname = "IMAGE_PT_select_best_image"
@@ -168,47 +892,183 @@ class IMAGE_PT_select_best_image(Panel):
         col = layout.column(align=True)
         col.operator("object.select_best_image", text="Open Images Folder")
         col.prop(context.scene, "select_best_image_directory", text="Image Folder")
+        col.prop(context.scene, "select_best_image_cache_size", text="Loaded Images")
+        row = col.row(align=True)
+        row.operator("object.watch_images_folder", text="Stop Watching" if folder_watcher else "Watch Folder",
+                     depress=folder_watcher is not None)
+        row.prop(context.scene, "select_best_image_watch_interval", text="Interval")
         col.separator()
 
         current_image = context.space_data.image
         if current_image:
-            object_name = current_image.name.split('_')[0]
+            file_name = get_image_file_name(current_image)
+            object_name, step = parse_image_name(file_name)
             col.label(text=f"Current object: {object_name}")
+            picked_image = pick_journal.get_pick(object_name) if pick_journal else None
+            if picked_image:
+                col.label(text=f"Picked: {picked_image}", icon='CHECKMARK')
+            selection = image_scores["objects"].get(object_name)
+            if selection:
+                score = image_scores["images"].get(file_name, {}).get("score")
+                if score is not None:
+                    best = " (best)" if selection["best"] == file_name else ""
+                    col.label(text=f"Score: {score:.2f}{best}")
+                if selection["low_confidence"]:
+                    col.label(text="Low confidence, review manually", icon='ERROR')
         else:
             col.label(text="No image selected")
 
         row = col.row(align=True)
         row.operator("object.previous_object", text="Previous Object")
         row.operator("object.next_object", text="Next Object")
+        if object_list_state["index"] is not image_index or (
+                image_index is not None and object_list_state["version"] != image_index.version):
+            request_object_list_sync()
+        col.template_list("IMAGE_UL_select_best_image_objects", "", context.window_manager, "select_best_image_objects",
+                          context.window_manager, "select_best_image_active_object", rows=8)
         col.separator()
-        if current_image:
-            image_suffix = current_image.name.split('_')[1].split('.')[0]
-            col.label(text=f"Image number: {image_suffix}")
+        if current_image and step is not None:
+            col.label(text=f"Image number: {step}")
         row = col.row(align=True)
         row.operator("object.previous_image", text="Previous Image")
         row.operator("object.next_image", text="Next Image")
         col.separator()
+        col.operator("object.show_contact_sheet", text="Show Contact Sheet")
+        col.prop(context.scene, "select_best_image_tile_size", text="Tile Size")
+        if is_showing_contact_sheet(context):
+            col.label(text="Double-click a tile to pick it")
+        col.separator()
         col.operator("object.pick_this_image", text="Pick This Image")
+        col.separator()
+        row = col.row(align=True)
+        row.operator("object.score_images", text="Score Images")
+        row.prop(context.scene, "select_best_image_score_workers", text="Workers")
+        col.operator("object.pick_best_images", text="Pick Best Images")
+        col.separator()
+        pending = len(pick_journal.pending) if pick_journal else 0
+        col.label(text=f"Picks to commit: {pending}")
+        row = col.row(align=True)
+        row.operator("object.commit_picks", text="Commit Picks")
+        row.operator("object.undo_pick_commit", text="Undo Commit")
+        col.operator("object.find_duplicate_images", text="Find Duplicate Images")
+        col.separator()
+        col.prop(context.scene, "select_best_image_workbook_path", text="Workbook")
+        col.operator("object.export_media_workbook", text="Export Media Workbook")
+        col.prop(context.scene, "select_best_image_package_path", text="Package")
+        col.operator("object.export_import_package", text="Export Import Package")
 
 def register():
     bpy.utils.register_class(OBJECT_OT_select_best_image)
+    bpy.utils.register_class(SelectBestImageObject)
+    bpy.utils.register_class(IMAGE_UL_select_best_image_objects)
+    bpy.utils.register_class(OBJECT_OT_watch_images_folder)
     bpy.utils.register_class(OBJECT_OT_next_image)
     bpy.utils.register_class(OBJECT_OT_previous_image)
     bpy.utils.register_class(OBJECT_OT_pick_this_image)
     bpy.utils.register_class(OBJECT_OT_next_object)
     bpy.utils.register_class(OBJECT_OT_previous_object)
+    bpy.utils.register_class(OBJECT_OT_show_contact_sheet)
+    bpy.utils.register_class(OBJECT_OT_pick_contact_sheet_tile)
+    bpy.utils.register_class(OBJECT_OT_score_images)
+    bpy.utils.register_class(OBJECT_OT_pick_best_images)
+    bpy.utils.register_class(OBJECT_OT_find_duplicate_images)
+    bpy.utils.register_class(OBJECT_OT_export_media_workbook)
+    bpy.utils.register_class(OBJECT_OT_export_import_package)
+    bpy.utils.register_class(OBJECT_OT_commit_picks)
+    bpy.utils.register_class(OBJECT_OT_undo_pick_commit)
     bpy.utils.register_class(IMAGE_PT_select_best_image)
     bpy.types.Scene.select_best_image_directory = StringProperty(default="", subtype='DIR_PATH')
+    bpy.types.WindowManager.select_best_image_objects = CollectionProperty(type=SelectBestImageObject)
+    bpy.types.WindowManager.select_best_image_active_object = IntProperty(
+        name="Object",
+        description="Object shown in the image editor",
+        default=0,
+        update=show_selected_object,
+    )
+    bpy.types.Scene.select_best_image_cache_size = IntProperty(
+        name="Loaded Images",
+        description="Maximum number of review images kept loaded in memory",
+        default=64,
+        min=4,
+    )
+    bpy.types.Scene.select_best_image_tile_size = IntProperty(
+        name="Tile Size",
+        description="Size in pixels of each image in the contact sheet",
+        default=256,
+        min=32,
+        max=2048,
+    )
+    bpy.types.Scene.select_best_image_watch_interval = FloatProperty(
+        name="Watch Interval",
+        description="Seconds between checks of the images folder for new images",
+        default=2.0,
+        min=0.5,
+        max=60.0,
+        subtype='TIME_ABSOLUTE',
+    )
+    bpy.types.Scene.select_best_image_workbook_path = StringProperty(
+        name="Workbook",
+        description="Media import workbook to write, in the images folder if left empty",
+        default="",
+        subtype='FILE_PATH',
+    )
+    bpy.types.Scene.select_best_image_package_path = StringProperty(
+        name="Package",
+        description="Zip archive for the import share that committed picks are added to",
+        default="",
+        subtype='FILE_PATH',
+    )
+    bpy.types.Scene.select_best_image_score_workers = IntProperty(
+        name="Workers",
+        description="Number of background Blender processes scoring images",
+        default=4,
+        min=1,
+        max=64,
+    )
+
+    # Double-clicking a contact sheet tile picks its image
+    keyconfig = bpy.context.window_manager.keyconfigs.addon
+    if keyconfig:
+        keymap = keyconfig.keymaps.new(name='Image', space_type='IMAGE_EDITOR')
+        keymap_item = keymap.keymap_items.new(OBJECT_OT_pick_contact_sheet_tile.bl_idname, 'LEFTMOUSE', 'DOUBLE_CLICK')
+        addon_keymaps.append((keymap, keymap_item))
 
 def unregister():
     bpy.utils.unregister_class(OBJECT_OT_select_best_image)
+    stop_watching_images_folder()
+    if bpy.app.timers.is_registered(sync_object_list):
+        bpy.app.timers.unregister(sync_object_list)
+    bpy.utils.unregister_class(OBJECT_OT_watch_images_folder)
+    bpy.utils.unregister_class(IMAGE_UL_select_best_image_objects)
     bpy.utils.unregister_class(OBJECT_OT_next_image)
     bpy.utils.unregister_class(OBJECT_OT_previous_image)
     bpy.utils.unregister_class(OBJECT_OT_pick_this_image)
     bpy.utils.unregister_class(OBJECT_OT_next_object)
     bpy.utils.unregister_class(OBJECT_OT_previous_object)
+    bpy.utils.unregister_class(OBJECT_OT_show_contact_sheet)
+    bpy.utils.unregister_class(OBJECT_OT_pick_contact_sheet_tile)
+    bpy.utils.unregister_class(OBJECT_OT_score_images)
+    bpy.utils.unregister_class(OBJECT_OT_pick_best_images)
+    bpy.utils.unregister_class(OBJECT_OT_find_duplicate_images)
+    bpy.utils.unregister_class(OBJECT_OT_export_media_workbook)
+    bpy.utils.unregister_class(OBJECT_OT_export_import_package)
+    bpy.utils.unregister_class(OBJECT_OT_commit_picks)
+    bpy.utils.unregister_class(OBJECT_OT_undo_pick_commit)
     bpy.utils.unregister_class(IMAGE_PT_select_best_image)
     del bpy.types.Scene.select_best_image_directory
+    del bpy.types.WindowManager.select_best_image_objects
+    del bpy.types.WindowManager.select_best_image_active_object
+    bpy.utils.unregister_class(SelectBestImageObject)
+    del bpy.types.Scene.select_best_image_cache_size
+    del bpy.types.Scene.select_best_image_tile_size
+    del bpy.types.Scene.select_best_image_watch_interval
+    del bpy.types.Scene.select_best_image_workbook_path
+    del bpy.types.Scene.select_best_image_package_path
+    del bpy.types.Scene.select_best_image_score_workers
+
+    for keymap, keymap_item in addon_keymaps:
+        keymap.keymap_items.remove(keymap_item)
+    addon_keymaps.clear()
 
 if __name__ == "__main__":
     register()
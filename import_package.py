@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import zipfile
+
+
+PACKAGE_STATE_SUFFIX = ".state.json"
+PACKAGE_MANIFEST_NAME = "manifest.json"
+
+# Formats that are compressed already and are stored in the package as they are
+STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.xlsx', '.zip')
+
+
+def get_compress_type(file_name):
+    return zipfile.ZIP_STORED if file_name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+
+
+# A zip archive for the PIM import share that images are appended to as they are picked.
+# Finalizing it appends the media workbook and a manifest with the checksum of every file.
+# What the archive contains is kept in a state file next to it, so appending never reads the archive.
+class ImportPackage:
+    def __init__(self, path):
+        self.path = path
+        self.state_path = path + PACKAGE_STATE_SUFFIX
+        self.entries = {}
+        self.finalized = False
+        if os.path.exists(self.path) and os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as state_file:
+                state = json.load(state_file)
+            self.entries = state["entries"]
+            self.finalized = state["finalized"]
+
+    def save_state(self):
+        with open(self.state_path, "w", encoding="utf-8") as state_file:
+            json.dump({"entries": self.entries, "finalized": self.finalized}, state_file)
+
+    # Stream a file into the archive, computing its checksum in the same pass
+    def write_file(self, archive, path, name):
+        info = zipfile.ZipInfo.from_file(path, name)
+        info.compress_type = get_compress_type(name)
+        checksum = hashlib.sha256()
+        with open(path, "rb") as source, archive.open(info, "w", force_zip64=True) as destination:
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                checksum.update(chunk)
+                destination.write(chunk)
+
+        stat = os.stat(path)
+        return {"sha256": checksum.hexdigest(), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    # Zip entries cannot be removed, so dropping entries means copying the others into a new archive
+    def rewrite(self, names):
+        temp_path = self.path + ".tmp"
+        with zipfile.ZipFile(self.path) as source_archive, zipfile.ZipFile(temp_path, "w") as archive:
+            for name in names:
+                info = source_archive.getinfo(name)
+                output_info = zipfile.ZipInfo(name, info.date_time)
+                output_info.compress_type = info.compress_type
+                with source_archive.open(info) as source, archive.open(output_info, "w", force_zip64=True) as destination:
+                    shutil.copyfileobj(source, destination, 1024 * 1024)
+        os.replace(temp_path, self.path)
+        self.entries = {name: self.entries[name] for name in names}
+
+    # Append images that are not in the archive yet. Images that changed since they were added are
+    # replaced, and a finalized archive is reopened by dropping its workbook and manifest.
+    def add_images(self, paths):
+        paths = {os.path.basename(path): path for path in paths}
+        changed = set()
+        for name, path in paths.items():
+            entry = self.entries.get(name)
+            if entry and (entry["size"] != os.path.getsize(path) or entry["mtime"] != os.path.getmtime(path)):
+                changed.add(name)
+
+        if self.finalized or changed:
+            self.rewrite([name for name, entry in self.entries.items() if name not in changed and not entry.get("final")])
+            self.finalized = False
+
+        new_names = [name for name in paths if name not in self.entries]
+        if new_names:
+            with zipfile.ZipFile(self.path, "a" if os.path.exists(self.path) else "w") as archive:
+                for name in new_names:
+                    self.entries[name] = self.write_file(archive, paths[name], name)
+        self.save_state()
+        return len(new_names)
+
+    # Append the media workbook and the manifest, which are the last entries of the archive
+    def finalize(self, workbook_path):
+        if self.finalized:
+            self.rewrite([name for name, entry in self.entries.items() if not entry.get("final")])
+
+        with zipfile.ZipFile(self.path, "a" if os.path.exists(self.path) else "w") as archive:
+            workbook_name = os.path.basename(workbook_path)
+            self.entries[workbook_name] = dict(self.write_file(archive, workbook_path, workbook_name), final=True)
+
+            manifest = {
+                "created_at": time.time(),
+                "files": {name: {"sha256": entry["sha256"], "size": entry["size"]} for name, entry in self.entries.items()},
+            }
+            archive.writestr(PACKAGE_MANIFEST_NAME, json.dumps(manifest, indent=2), zipfile.ZIP_DEFLATED)
+
+        self.entries[PACKAGE_MANIFEST_NAME] = {"sha256": "", "size": 0, "mtime": 0, "final": True}
+        self.finalized = True
+        self.save_state()
+        return len(manifest["files"])
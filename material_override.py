@@ -0,0 +1,106 @@
+import fnmatch
+import bpy
+
+
+# A material name pattern and the material assigned to matching material slots
+class MaterialOverrideRule(bpy.types.PropertyGroup):
+    pattern: bpy.props.StringProperty(
+        name="Pattern",
+        description="Material name pattern, for example *steel*",
+        default="*",
+    )
+    material: bpy.props.PointerProperty(name="Material", type=bpy.types.Material)
+
+
+# Find the override for one original material, or None to keep the original
+def get_override_material(material, render_settings):
+    if render_settings.material_override == "SINGLE":
+        return render_settings.override_material
+
+    if render_settings.material_override == "PALETTE":
+        material_name = material.name if material else ""
+        for rule in render_settings.material_override_rules:
+            if rule.material and fnmatch.fnmatchcase(material_name, rule.pattern):
+                return rule.material
+        return render_settings.override_material
+
+    return None
+
+
+# Temporarily assign override materials to an object and return what is needed to restore it
+def apply_material_override(obj, render_settings):
+    saved_materials = {"slots": [], "appended": False}
+    if render_settings.material_override == "NONE" or obj.type != 'MESH':
+        return saved_materials
+
+    if not obj.material_slots:
+        override_material = get_override_material(None, render_settings)
+        if override_material:
+            obj.data.materials.append(override_material)
+            saved_materials["appended"] = True
+        return saved_materials
+
+    for index, slot in enumerate(obj.material_slots):
+        override_material = get_override_material(slot.material, render_settings)
+        if override_material and override_material != slot.material:
+            saved_materials["slots"].append((index, slot.material))
+            slot.material = override_material
+
+    return saved_materials
+
+
+def restore_materials(obj, saved_materials):
+    for index, material in saved_materials["slots"]:
+        obj.material_slots[index].material = material
+
+    if saved_materials["appended"]:
+        obj.data.materials.pop()
+
+
+class RENDER_OT_add_material_override_rule(bpy.types.Operator):
+    bl_idname = "render.add_material_override_rule"
+    bl_label = "Add Material Rule"
+    bl_description = "Add a material name pattern to the override palette"
+
+    def execute(self, context):
+        context.scene.automated_object_renderer.material_override_rules.add()
+        return {'FINISHED'}
+
+
+class RENDER_OT_remove_material_override_rule(bpy.types.Operator):
+    bl_idname = "render.remove_material_override_rule"
+    bl_label = "Remove Material Rule"
+    bl_description = "Remove a material name pattern from the override palette"
+
+    index: bpy.props.IntProperty()
+
+    def execute(self, context):
+        context.scene.automated_object_renderer.material_override_rules.remove(self.index)
+        return {'FINISHED'}
+
+
+def draw_material_override_settings(layout, render_settings):
+    layout.prop(render_settings, "material_override")
+    if render_settings.material_override == "NONE":
+        return
+
+    layout.prop(render_settings, "override_material")
+    if render_settings.material_override == "PALETTE":
+        for index, rule in enumerate(render_settings.material_override_rules):
+            row = layout.row(align=True)
+            row.prop(rule, "pattern", text="")
+            row.prop(rule, "material", text="")
+            row.operator(RENDER_OT_remove_material_override_rule.bl_idname, text="", icon='X').index = index
+        layout.operator(RENDER_OT_add_material_override_rule.bl_idname, icon='ADD')
+
+
+def register():
+    bpy.utils.register_class(MaterialOverrideRule)
+    bpy.utils.register_class(RENDER_OT_add_material_override_rule)
+    bpy.utils.register_class(RENDER_OT_remove_material_override_rule)
+
+
+def unregister():
+    bpy.utils.unregister_class(MaterialOverrideRule)
+    bpy.utils.unregister_class(RENDER_OT_add_material_override_rule)
+    bpy.utils.unregister_class(RENDER_OT_remove_material_override_rule)
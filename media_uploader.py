@@ -0,0 +1,178 @@
+import http.client
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from .render_manifest import get_file_checksum
+
+
+UPLOAD_STATE_FILE_NAME = "upload_state.jsonl"
+UPLOAD_TOKEN_VARIABLE = "MEDIA_UPLOAD_TOKEN"
+
+# Responses that mean the server is busy or failing for now, and the request should be retried
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class UploadError(Exception):
+    pass
+
+
+# Uploads files to a media endpoint that stores files by checksum:
+#   HEAD {url}/media/{sha256} answers 200 if the server has the file,
+#   PUT {url}/media/{sha256} uploads it, with its file name in the X-File-Name header.
+# Every worker thread keeps its own keep-alive connection.
+class MediaUploader:
+    def __init__(self, url, token=None, concurrency=4, max_attempts=5, backoff=0.5, timeout=60):
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+            raise ValueError(f"Invalid upload URL: {url}")
+
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.token = token if token is not None else os.environ.get(UPLOAD_TOKEN_VARIABLE, "")
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            connection = connection_class(self.host, self.port, timeout=self.timeout)
+            self.local.connection = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def reset_connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+
+    # Send a request on this thread's connection, reconnecting and backing off when it fails.
+    # open_body is called again for every attempt so that file bodies start from the beginning.
+    def request(self, method, path, headers=None, open_body=None):
+        headers = dict(headers or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        for attempt in range(self.max_attempts):
+            body = open_body() if open_body else None
+            try:
+                connection = self.get_connection()
+                connection.request(method, self.base_path + path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status not in RETRY_STATUSES:
+                    return response.status
+                error = f"HTTP {response.status}"
+            except (OSError, http.client.HTTPException) as e:
+                self.reset_connection()
+                error = str(e) or type(e).__name__
+            finally:
+                if body is not None:
+                    body.close()
+
+            if attempt + 1 < self.max_attempts:
+                time.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+
+        raise UploadError(f"{method} {path} failed after {self.max_attempts} attempts: {error}")
+
+    def has_file(self, checksum):
+        return self.request("HEAD", f"/media/{checksum}") == 200
+
+    # Upload a file unless the server already has a file with its checksum
+    def upload_file(self, path, checksum):
+        if self.has_file(checksum):
+            return "skipped"
+
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(os.path.getsize(path)),
+            "X-File-Name": urllib.parse.quote(os.path.basename(path)),
+        }
+        status = self.request("PUT", f"/media/{checksum}", headers, lambda: open(path, "rb"))
+        if status not in {200, 201, 204}:
+            raise UploadError(f"PUT {os.path.basename(path)} was answered with HTTP {status}")
+        return "uploaded"
+
+
+# Append-only record of finished uploads, so that an interrupted upload resumes where it stopped
+class UploadState:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, UPLOAD_STATE_FILE_NAME)
+        self.done = set()
+        self.lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as state_file:
+                for line in state_file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.done.add((entry["name"], entry["sha256"]))
+
+    def is_done(self, path, checksum):
+        return (os.path.basename(path), checksum) in self.done
+
+    def mark_done(self, path, checksum, status):
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as state_file:
+                state_file.write(json.dumps({"name": os.path.basename(path), "sha256": checksum, "status": status,
+                                             "time": time.time()}) + "\n")
+            self.done.add((os.path.basename(path), checksum))
+
+
+# Upload files given as (path, checksum) pairs, computing missing checksums, and summarize the throughput
+def upload_files(uploader, files, state=None):
+    summary = {"uploaded": 0, "skipped": 0, "failed": 0, "bytes": 0, "errors": []}
+    lock = threading.Lock()
+
+    def upload(item):
+        path, checksum = item
+        try:
+            checksum = checksum or get_file_checksum(path)
+            if state and state.is_done(path, checksum):
+                status = "skipped"
+            else:
+                status = uploader.upload_file(path, checksum)
+                if state:
+                    state.mark_done(path, checksum, status)
+            size = os.path.getsize(path) if status == "uploaded" else 0
+        except (OSError, UploadError) as e:
+            with lock:
+                summary["failed"] += 1
+                summary["errors"].append(f"{os.path.basename(path)}: {e}")
+            return
+
+        with lock:
+            summary[status] += 1
+            summary["bytes"] += size
+
+    start_time = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=uploader.concurrency) as executor:
+            list(executor.map(upload, files))
+    finally:
+        uploader.close()
+
+    duration = time.perf_counter() - start_time
+    summary["duration"] = duration
+    summary["bytes_per_second"] = summary["bytes"] / max(duration, 1e-6)
+    summary["files_per_second"] = summary["uploaded"] / max(duration, 1e-6)
+    return summary
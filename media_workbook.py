@@ -0,0 +1,220 @@
+import itertools
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+# openpyxl is bundled with the add-on since Blender's Python does not include it
+LIBS_DIRECTORY = os.path.join(os.path.dirname(__file__), "libs")
+if LIBS_DIRECTORY not in sys.path:
+    sys.path.append(LIBS_DIRECTORY)
+
+from openpyxl import Workbook, load_workbook
+
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "Import Template for Media.xlsx")
+PRODUCT_IMAGES_SHEET = "ProductImages"
+IMAGES_SHEET = "Images"
+PRODUCT_IMAGE_TYPE = "Product"
+EXTRA_PRODUCT_IMAGE_COUNT = 2
+
+# Render views in the order their images are used as main and extra product images
+VIEW_NAMES = ("iso", "side", "top")
+
+SPREADSHEET_NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+PACKAGE_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+
+# Split a reviewed object name like "Part_Aiso" into the SKU and the view it was rendered from
+def get_sku(object_name):
+    for view in VIEW_NAMES:
+        if object_name.endswith(view) and len(object_name) > len(view):
+            return object_name[:-len(view)], view
+    return object_name, ""
+
+
+def get_view_order(view):
+    return VIEW_NAMES.index(view) if view in VIEW_NAMES else len(VIEW_NAMES)
+
+
+# Yield the SKU and image file names of every product, from the picked images of a review folder
+def get_picked_product_images(object_names, get_picked_image):
+    products = {}
+    for object_name in object_names:
+        file_name = get_picked_image(object_name)
+        if file_name:
+            sku, view = get_sku(object_name)
+            products.setdefault(sku, []).append((get_view_order(view), file_name))
+
+    for sku in sorted(products):
+        yield sku, [file_name for order, file_name in sorted(products[sku])]
+
+
+# Yield the SKU and image file names of every product, from the first image of each view in a render manifest
+def get_manifest_product_images(manifest):
+    for object_name, views in itertools.groupby(manifest.first_view_images(), key=lambda image: image[0]):
+        images = sorted((get_view_order(view), os.path.basename(path)) for name, view, path in views)
+        yield object_name, [file_name for order, file_name in images]
+
+
+# Read the SKUs of the ProductImages sheet of a filled import workbook, with the main image file of each
+# if it has one. Rows without a ProductSKU use their VirtualSKU.
+def read_work_list(workbook_path):
+    workbook = load_workbook(workbook_path, read_only=True)
+    try:
+        rows = workbook[PRODUCT_IMAGES_SHEET].iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+        columns = {name: header.index(name) for name in ("ProductSKU", "VirtualSKU", "MainProductImage__File") if name in header}
+        if "ProductSKU" not in columns and "VirtualSKU" not in columns:
+            raise ValueError(f"{PRODUCT_IMAGES_SHEET} sheet has no ProductSKU or VirtualSKU column")
+
+        def get_value(row, name):
+            column = columns.get(name)
+            if column is None or column >= len(row) or row[column] is None:
+                return ""
+            return str(row[column]).strip()
+
+        work_list = {}
+        for row in rows:
+            sku = get_value(row, "ProductSKU") or get_value(row, "VirtualSKU")
+            if sku:
+                work_list[sku] = get_value(row, "MainProductImage__File") or work_list.get(sku)
+        return work_list
+    finally:
+        workbook.close()
+
+
+# Map the sheet names of a workbook to the paths of their XML parts in the package
+def get_sheet_paths(archive):
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    relationships = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {relationship.get("Id"): relationship.get("Target") for relationship in relationships.iter(PACKAGE_RELATIONSHIP)}
+
+    sheet_paths = {}
+    for sheet in workbook.iter(SPREADSHEET_NAMESPACE + "sheet"):
+        target = targets[sheet.get(RELATIONSHIP_ID)]
+        sheet_paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+    return sheet_paths
+
+
+# Read the column names of the header row of each sheet without loading the rest of the workbook
+def read_headers(template_path, sheet_names):
+    workbook = load_workbook(template_path, read_only=True)
+    try:
+        return {name: [value for value in next(workbook[name].iter_rows(max_row=1, values_only=True)) if value]
+                for name in sheet_names}
+    finally:
+        workbook.close()
+
+
+def get_product_row(header, sku, file_names):
+    values = {
+        "ProductSKU": sku,
+        "MainProductImage__File": file_names[0],
+        "MainProductImage__Name": sku,
+        "MainProductImage__ImageType": PRODUCT_IMAGE_TYPE,
+    }
+    for number, file_name in enumerate(file_names[1:EXTRA_PRODUCT_IMAGE_COUNT + 1], 1):
+        values[f"ExtraProductImage{number}__File"] = file_name
+        values[f"ExtraProductImage{number}__Name"] = sku
+        values[f"ExtraProductImage{number}__ImageType"] = PRODUCT_IMAGE_TYPE
+    return [values.get(column) for column in header]
+
+
+def get_image_row(header, sku, file_name):
+    values = {"File": file_name, "Name": sku, "ImageType": PRODUCT_IMAGE_TYPE}
+    return [values.get(column) for column in header]
+
+
+# Copy the data rows of a generated sheet, skipping its header row, without reading it into memory
+def copy_data_rows(source, destination, chunk_size=1024 * 1024):
+    buffer = b""
+    while b"</row>" not in buffer:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        buffer += chunk
+    buffer = buffer[buffer.index(b"</row>") + len(b"</row>"):]
+
+    end_marker = b"</sheetData>"
+    while True:
+        end = buffer.find(end_marker)
+        if end >= 0:
+            destination.write(buffer[:end])
+            return
+        chunk = source.read(chunk_size)
+        if not chunk:
+            raise ValueError("Generated sheet has no end of sheet data")
+
+        # Keep enough of the buffer to find an end marker split between two chunks
+        keep = len(end_marker) - 1
+        destination.write(buffer[:-keep])
+        buffer = buffer[-keep:] + chunk
+
+
+# Write a template sheet with its styled header row and everything after the rows kept,
+# and the rows of the generated sheet in between
+def write_spliced_sheet(template_xml, generated_sheet, destination, row_count):
+    header_end = template_xml.index(b"</row>") + len(b"</row>")
+    data_end = template_xml.index(b"</sheetData>")
+
+    head = re.sub(rb'<dimension ref="A1:([A-Z]+)\d+"/>',
+                  lambda match: b'<dimension ref="A1:' + match.group(1) + str(row_count).encode() + b'"/>',
+                  template_xml[:header_end])
+    destination.write(head)
+    copy_data_rows(generated_sheet, destination)
+    destination.write(template_xml[data_end:])
+
+
+# Write a copy of the media import template with the ProductImages and Images sheets filled in.
+# Rows are streamed through openpyxl's write-only worksheets and spliced into the template's own
+# sheet parts, so all other template sheets are copied byte for byte and memory use stays flat.
+def write_media_workbook(output_path, product_images, template_path=TEMPLATE_PATH):
+    sheet_names = (PRODUCT_IMAGES_SHEET, IMAGES_SHEET)
+    headers = read_headers(template_path, sheet_names)
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        workbook = Workbook(write_only=True)
+        sheets = {name: workbook.create_sheet(name) for name in sheet_names}
+        for name in sheet_names:
+            sheets[name].append(headers[name])
+
+        row_counts = {name: 1 for name in sheet_names}
+        for sku, file_names in product_images:
+            if not file_names:
+                continue
+            sheets[PRODUCT_IMAGES_SHEET].append(get_product_row(headers[PRODUCT_IMAGES_SHEET], sku, file_names))
+            row_counts[PRODUCT_IMAGES_SHEET] += 1
+            for file_name in file_names[:EXTRA_PRODUCT_IMAGE_COUNT + 1]:
+                sheets[IMAGES_SHEET].append(get_image_row(headers[IMAGES_SHEET], sku, file_name))
+                row_counts[IMAGES_SHEET] += 1
+
+        generated_path = os.path.join(temp_directory, "generated.xlsx")
+        workbook.save(generated_path)
+
+        temp_output_path = output_path + ".tmp"
+        with zipfile.ZipFile(template_path) as template, zipfile.ZipFile(generated_path) as generated, \
+                zipfile.ZipFile(temp_output_path, "w", zipfile.ZIP_DEFLATED) as output:
+            template_sheets = get_sheet_paths(template)
+            generated_sheets = get_sheet_paths(generated)
+            replaced = {template_sheets[name]: name for name in sheet_names}
+
+            for info in template.infolist():
+                output_info = zipfile.ZipInfo(info.filename, info.date_time)
+                output_info.compress_type = zipfile.ZIP_DEFLATED
+                with output.open(output_info, "w", force_zip64=True) as destination:
+                    name = replaced.get(info.filename)
+                    if name is None:
+                        with template.open(info) as source:
+                            shutil.copyfileobj(source, destination, 1024 * 1024)
+                    else:
+                        with generated.open(generated_sheets[name]) as generated_sheet:
+                            write_spliced_sheet(template.read(info), generated_sheet, destination, row_counts[name])
+
+        os.replace(temp_output_path, output_path)
+
+    return row_counts[PRODUCT_IMAGES_SHEET] - 1
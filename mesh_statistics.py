@@ -0,0 +1,83 @@
+import hashlib
+import numpy as np
+
+
+# Geometry statistics of one mesh datablock in its local space
+class MeshStatistics:
+    def __init__(self, vertex_count, polygon_count, loop_count, bounds_min, bounds_max, centroid,
+                 sphere_center, sphere_radius, principal_axes, fingerprint):
+        self.vertex_count = vertex_count
+        self.polygon_count = polygon_count
+        self.loop_count = loop_count
+        self.bounds_min = bounds_min
+        self.bounds_max = bounds_max
+        self.centroid = centroid
+        self.sphere_center = sphere_center
+        self.sphere_radius = sphere_radius
+        self.principal_axes = principal_axes
+        self.fingerprint = fingerprint
+
+    @property
+    def bounds_center(self):
+        return 0.5 * (self.bounds_min + self.bounds_max)
+
+    @property
+    def dimensions(self):
+        return self.bounds_max - self.bounds_min
+
+    # The eight corners of the bounding box, in the same order as Object.bound_box
+    @property
+    def corners(self):
+        (x0, y0, z0), (x1, y1, z1) = self.bounds_min, self.bounds_max
+        return np.array([(x0, y0, z0), (x0, y0, z1), (x0, y1, z1), (x0, y1, z0),
+                         (x1, y0, z0), (x1, y0, z1), (x1, y1, z1), (x1, y1, z0)])
+
+
+# Statistics of the meshes of a run, computed once per mesh datablock.
+# Vertex coordinates are read into one buffer that is only reallocated when a larger mesh comes along.
+class MeshStatisticsCache:
+    def __init__(self):
+        self.statistics = {}
+        self.buffer = np.empty(0, dtype=np.float32)
+
+    def get(self, mesh):
+        statistics = self.statistics.get(mesh.name_full)
+        if statistics is None:
+            statistics = self.statistics[mesh.name_full] = self.compute(mesh)
+        return statistics
+
+    # Forget a mesh whose vertices were changed, like by setting its object's origin
+    def discard(self, mesh):
+        self.statistics.pop(mesh.name_full, None)
+
+    def compute(self, mesh):
+        vertex_count = len(mesh.vertices)
+        if len(self.buffer) < vertex_count * 3:
+            self.buffer = np.empty(vertex_count * 3, dtype=np.float32)
+        coordinates = self.buffer[:vertex_count * 3]
+        mesh.vertices.foreach_get("co", coordinates)
+
+        # The fingerprint hashes the same bytes as earlier framing caches did, so their entries stay valid
+        polygon_count = len(mesh.polygons)
+        checksum = hashlib.sha1(coordinates.tobytes())
+        checksum.update(f"{vertex_count}:{polygon_count}".encode("utf-8"))
+
+        if vertex_count == 0:
+            zero = np.zeros(3)
+            return MeshStatistics(0, polygon_count, len(mesh.loops), zero, zero, zero, zero, 0.0, np.identity(3),
+                                  checksum.hexdigest())
+
+        points = coordinates.reshape(-1, 3).astype(np.float64)
+        bounds_min = points.min(axis=0)
+        bounds_max = points.max(axis=0)
+        centroid = points.mean(axis=0)
+        sphere_center = 0.5 * (bounds_min + bounds_max)
+        sphere_radius = float(np.sqrt(np.max(np.einsum("ij,ij->i", points - sphere_center, points - sphere_center))))
+
+        # Principal axes as rows, from the largest to the smallest spread of the vertices
+        centered = points - centroid
+        eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered / vertex_count)
+        principal_axes = eigenvectors[:, ::-1].T
+
+        return MeshStatistics(vertex_count, polygon_count, len(mesh.loops), bounds_min, bounds_max, centroid,
+                              sphere_center, sphere_radius, principal_axes, checksum.hexdigest())
@@ -0,0 +1,133 @@
+import os
+import re
+import bpy
+
+
+# Subdirectories of the output directory that hold extra format copies, such as JPEG_90
+EXTRA_FORMAT_DIRECTORY_PATTERN = re.compile(r"^(PNG|TIFF|JPEG_\d+|WEBP_\d+)$")
+
+
+FILE_FORMAT_ITEMS = [
+    ('PNG', "PNG", ""),
+    ('JPEG', "JPEG", ""),
+    ('TIFF', "TIFF", ""),
+    ('WEBP', "WebP", ""),
+]
+
+
+# The extra file formats the running Blender can write, since WebP is missing from older and some custom builds
+def get_file_format_items():
+    available = bpy.types.ImageFormatSettings.bl_rna.properties["file_format"].enum_items.keys()
+    return [item for item in FILE_FORMAT_ITEMS if item[0] in available]
+
+
+# An additional file format that every render is also encoded into
+class OutputFormat(bpy.types.PropertyGroup):
+    file_format: bpy.props.EnumProperty(
+        name="File Format",
+        items=get_file_format_items(),
+        default='JPEG',
+    )
+    quality: bpy.props.IntProperty(
+        name="Quality",
+        description="Quality of lossy formats",
+        default=90,
+        min=0,
+        max=100,
+        subtype='PERCENTAGE',
+    )
+
+
+def is_extra_format_path(relative_path):
+    return bool(EXTRA_FORMAT_DIRECTORY_PATTERN.match(relative_path.replace("\\", "/").split("/")[0]))
+
+
+def get_format_directory_name(output_format):
+    if output_format.file_format in {'JPEG', 'WEBP'}:
+        return f"{output_format.file_format}_{output_format.quality}"
+    return output_format.file_format
+
+
+# Encode the current render result into every extra format without rendering again.
+# Returns the paths of all extra images and of the ones that were actually written.
+def save_extra_formats(scene, render_settings, output_directory, shard_name, file_name, skip_existing=False):
+    image_paths = []
+    written_paths = []
+    if not render_settings.extra_formats:
+        return image_paths, written_paths
+
+    image_settings = scene.render.image_settings
+    # Switching to a format like JPEG also drops the alpha channel and can change the bit depth, and
+    # switching back does not bring them back, so all of them are put back after the extra formats
+    original_file_format = image_settings.file_format
+    original_color_mode = image_settings.color_mode
+    original_color_depth = image_settings.color_depth
+    original_quality = image_settings.quality
+    render_result = bpy.data.images["Render Result"]
+
+    try:
+        for output_format in render_settings.extra_formats:
+            format_directory = os.path.join(output_directory, get_format_directory_name(output_format), shard_name)
+            if not os.path.exists(format_directory):
+                os.makedirs(format_directory)
+
+            image_settings.file_format = output_format.file_format
+            image_settings.quality = output_format.quality
+            image_path = os.path.join(format_directory, file_name) + scene.render.file_extension
+            image_paths.append(image_path)
+            if skip_existing and os.path.exists(image_path):
+                continue
+
+            render_result.save_render(image_path, scene=scene)
+            written_paths.append(image_path)
+    finally:
+        image_settings.file_format = original_file_format
+        image_settings.color_mode = original_color_mode
+        image_settings.color_depth = original_color_depth
+        image_settings.quality = original_quality
+
+    return image_paths, written_paths
+
+
+class RENDER_OT_add_output_format(bpy.types.Operator):
+    bl_idname = "render.add_output_format"
+    bl_label = "Add Output Format"
+    bl_description = "Also save every render in another file format"
+
+    def execute(self, context):
+        context.scene.automated_object_renderer.extra_formats.add()
+        return {'FINISHED'}
+
+
+class RENDER_OT_remove_output_format(bpy.types.Operator):
+    bl_idname = "render.remove_output_format"
+    bl_label = "Remove Output Format"
+    bl_description = "Stop saving renders in this file format"
+
+    index: bpy.props.IntProperty()
+
+    def execute(self, context):
+        context.scene.automated_object_renderer.extra_formats.remove(self.index)
+        return {'FINISHED'}
+
+
+def draw_output_format_settings(layout, render_settings):
+    for index, output_format in enumerate(render_settings.extra_formats):
+        row = layout.row(align=True)
+        row.prop(output_format, "file_format", text="")
+        if output_format.file_format in {'JPEG', 'WEBP'}:
+            row.prop(output_format, "quality")
+        row.operator(RENDER_OT_remove_output_format.bl_idname, text="", icon='X').index = index
+    layout.operator(RENDER_OT_add_output_format.bl_idname, icon='ADD')
+
+
+def register():
+    bpy.utils.register_class(OutputFormat)
+    bpy.utils.register_class(RENDER_OT_add_output_format)
+    bpy.utils.register_class(RENDER_OT_remove_output_format)
+
+
+def unregister():
+    bpy.utils.unregister_class(OutputFormat)
+    bpy.utils.unregister_class(RENDER_OT_add_output_format)
+    bpy.utils.unregister_class(RENDER_OT_remove_output_format)
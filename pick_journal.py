@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+PICK_JOURNAL_FILE_NAME = "pick_journal.jsonl"
+OMITTED_DIRECTORY_NAME = "Omitted"
+
+
+# Whether a path relative to the images folder is inside the Omitted folder
+def is_omitted_path(relative_path):
+    return relative_path.split(os.sep)[0] == OMITTED_DIRECTORY_NAME
+
+
+# Plan the moves of one pick as paths relative to the images folder: the other images of the object
+# go to the Omitted folder and the picked image is renamed to the object name in its own folder,
+# which is a shard of the images folder when the renderer wrote a sharded layout
+def get_pick_moves(object_name, image, images):
+    moves = []
+    for other_image in images:
+        if other_image != image:
+            moves.append((other_image, os.path.join(OMITTED_DIRECTORY_NAME, os.path.basename(other_image))))
+    moves.append((image, os.path.join(os.path.dirname(image), object_name + os.path.splitext(image)[1])))
+    return moves
+
+
+def move_file(directory, source, destination):
+    source_path = os.path.join(directory, source)
+    destination_path = os.path.join(directory, destination)
+
+    # Moves that were applied before an interrupted commit or undo are already done
+    if not os.path.exists(source_path) and os.path.exists(destination_path):
+        return
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    os.replace(source_path, destination_path)
+
+
+# Apply moves concurrently and return the moves that succeeded and the errors of those that failed
+def apply_moves(directory, moves, workers):
+    def apply_move(move):
+        try:
+            move_file(directory, *move)
+        except OSError as e:
+            return e
+        return None
+
+    done, errors = [], []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for move, error in zip(moves, executor.map(apply_move, moves)):
+            if error is None:
+                done.append(move)
+            else:
+                errors.append(f"{move[0]}: {error}")
+    return done, errors
+
+
+# Append-only journal of the pick decisions of an images folder.
+# Picks are only recorded until they are committed, which applies all their file moves in one batch.
+class PickJournal:
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, PICK_JOURNAL_FILE_NAME)
+        self.pending = {}
+        self.commits = []
+        if os.path.exists(self.path):
+            self.replay()
+
+    def replay(self):
+        with open(self.path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                if line.strip():
+                    self.apply_entry(json.loads(line))
+
+    def apply_entry(self, entry):
+        if entry["type"] == "pick":
+            self.pending[entry["object"]] = {"image": entry["image"], "images": entry["images"]}
+        elif entry["type"] == "cancel":
+            self.pending.pop(entry["object"], None)
+        elif entry["type"] == "commit":
+            for object_name in entry["picks"]:
+                self.pending.pop(object_name, None)
+            self.commits.append(entry)
+        elif entry["type"] == "undo":
+            commit = self.commits.pop()
+            self.pending.update(commit["picks"])
+
+    def append(self, entry):
+        entry["time"] = time.time()
+        with open(self.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps(entry) + "\n")
+        self.apply_entry(entry)
+
+    # Record a pick by the paths of the picked image and of all images of the object,
+    # which are kept relative to the images folder
+    def record_pick(self, object_name, path, paths):
+        self.append({"type": "pick", "object": object_name, "image": os.path.relpath(path, self.directory),
+                     "images": [os.path.relpath(image_path, self.directory) for image_path in paths]})
+
+    def cancel_pick(self, object_name):
+        if object_name in self.pending:
+            self.append({"type": "cancel", "object": object_name})
+
+    # Get the file name of the pending pick of an object
+    def get_pick(self, object_name):
+        pick = self.pending.get(object_name)
+        return os.path.basename(pick["image"]) if pick else None
+
+    def plan_moves(self):
+        return {object_name: get_pick_moves(object_name, pick["image"], pick["images"])
+                for object_name, pick in self.pending.items()}
+
+    # Apply the moves of all pending picks. Picks with a failed move stay pending, with the moves
+    # that did succeed still recorded so that undo can revert them.
+    def commit(self, workers=8):
+        planned = self.plan_moves()
+        moves = [move for object_moves in planned.values() for move in object_moves]
+        done, errors = apply_moves(self.directory, moves, workers)
+
+        done_moves = set(done)
+        picks = {object_name: self.pending[object_name] for object_name, object_moves in planned.items()
+                 if all(move in done_moves for move in object_moves)}
+        if done:
+            self.append({"type": "commit", "picks": picks, "moves": done})
+        return done, errors
+
+    # Move the files of the last commit back and make its picks pending again
+    def undo(self, workers=8):
+        if not self.commits:
+            return [], []
+
+        moves = [(destination, source) for source, destination in reversed(self.commits[-1]["moves"])]
+        done, errors = apply_moves(self.directory, moves, workers)
+        if not errors:
+            self.append({"type": "undo"})
+        return done, errors
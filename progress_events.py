@@ -0,0 +1,90 @@
+import json
+import os
+import socket
+import time
+
+
+# Streams newline-delimited JSON progress events to a file, FIFO, TCP or Unix socket.
+# Frequent image events are buffered and written at most once per interval.
+class ProgressEventStream:
+    def __init__(self, target, interval=1.0):
+        self.interval = interval
+        self.host = socket.gethostname()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.file = None
+        self.socket = None
+
+        if target.startswith("tcp://"):
+            host, port = target[len("tcp://"):].rsplit(":", 1)
+            self.socket = socket.create_connection((host, int(port)), timeout=5.0)
+        elif target.startswith("unix://"):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.settimeout(5.0)
+            self.socket.connect(target[len("unix://"):])
+        else:
+            directory = os.path.dirname(target)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self.file = open(target, "a", encoding="utf-8")
+
+    def emit(self, event, **fields):
+        fields["event"] = event
+        fields["time"] = time.time()
+        fields["host"] = self.host
+        self.buffer.append(json.dumps(fields, default=str))
+
+        if event != "image_written" or time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        data = "\n".join(self.buffer) + "\n"
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+        # Monitoring must never interrupt rendering, so the stream is dropped on errors
+        try:
+            if self.socket:
+                self.socket.sendall(data.encode("utf-8"))
+            elif self.file:
+                self.file.write(data)
+                self.file.flush()
+        except OSError as error:
+            print(f"Progress event stream closed: {error}")
+            self.close()
+
+    def close(self):
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+# A stand-in used when no event target is configured
+class NullEventStream:
+    def emit(self, event, **fields):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_event_stream(target, interval):
+    if not target:
+        return NullEventStream()
+
+    # Monitoring must never stop a render, so unreachable and malformed targets, like a TCP target without
+    # a port, only disable the events
+    try:
+        return ProgressEventStream(target, interval)
+    except (OSError, OverflowError, ValueError) as error:
+        print(f"Could not open progress event stream {target}: {error}")
+        return NullEventStream()
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+
+MANIFEST_FILE_NAME = "render_manifest.sqlite"
+
+
+# Get the subdirectory of the output directory that an object's images are written to
+def get_shard_name(object_name, output_layout, shard_length):
+    if output_layout == "NAME_PREFIX":
+        prefix = re.sub(r"[^\w\-]", "_", object_name[:shard_length])
+        return prefix or "_"
+    if output_layout == "HASH":
+        return hashlib.sha1(object_name.encode("utf-8")).hexdigest()[:shard_length]
+    return ""
+
+
+def get_file_checksum(path):
+    checksum = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+# An index of every rendered image, stored next to the images in the output directory.
+# Rows are committed as they are added, so that a failed run keeps the rows of the images it wrote and
+# renderers sharing the output directory only wait for each other's commits.
+class RenderManifest:
+    def __init__(self, output_directory):
+        self.output_directory = output_directory
+        self.connection = sqlite3.connect(os.path.join(output_directory, MANIFEST_FILE_NAME), timeout=60)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS images ("
+            "path TEXT PRIMARY KEY, "
+            "object_name TEXT NOT NULL, "
+            "view TEXT NOT NULL, "
+            "step INTEGER NOT NULL, "
+            "settings_hash TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "checksum TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS images_object ON images (object_name, view, step)")
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        if self.connection is None:
+            return
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+
+    def add_image(self, path, object_name, view, step, settings_hash):
+        checksum = get_file_checksum(path)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                os.path.relpath(path, self.output_directory),
+                object_name,
+                view,
+                step,
+                settings_hash,
+                os.path.getsize(path),
+                checksum,
+                time.time(),
+            ),
+        )
+        return checksum
+
+    # Point the row of an image at its new path, given relative to the output directory, after it was renamed
+    def move_image(self, path, new_path):
+        self.connection.execute("UPDATE images SET path = ? WHERE path = ?", (os.path.normpath(new_path), os.path.normpath(path)))
+
+    def image_paths(self, object_name=None):
+        if object_name is None:
+            rows = self.connection.execute("SELECT path FROM images ORDER BY path")
+        else:
+            rows = self.connection.execute("SELECT path FROM images WHERE object_name = ? ORDER BY path", (object_name,))
+        return [os.path.join(self.output_directory, path) for path, in rows]
+
+    # Yield the first rotation step image of every view of every object, ordered by object name
+    def first_view_images(self):
+        rows = self.connection.execute(
+            "SELECT object_name, view, path, MIN(step) FROM images GROUP BY object_name, view ORDER BY object_name, view"
+        )
+        for object_name, view, path, step in rows:
+            yield object_name, view, os.path.join(self.output_directory, path)
+
+
+# Open the manifest of a folder if the renderer wrote one
+def open_existing_manifest(directory):
+    if os.path.exists(os.path.join(directory, MANIFEST_FILE_NAME)):
+        return RenderManifest(directory)
+    return None
@@ -0,0 +1,68 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import bpy
+
+
+# Profiles the first parts of a render run with cProfile and counts Blender-side work
+class RenderProfiler:
+    def __init__(self, part_limit, top_n):
+        self.profile = cProfile.Profile()
+        self.part_limit = part_limit
+        self.top_n = top_n
+        self.parts_profiled = 0
+        self.active = False
+        self.depsgraph_updates = 0
+        self.objects_evaluated = 0
+        self.render_time = 0.0
+        self.render_time_at_part_start = 0.0
+
+    def depsgraph_update(self, scene, depsgraph=None):
+        if self.active:
+            self.depsgraph_updates += 1
+            if depsgraph is not None:
+                self.objects_evaluated += sum(1 for update in depsgraph.updates if isinstance(update.id, bpy.types.Object))
+
+    def start(self):
+        bpy.app.handlers.depsgraph_update_post.append(self.depsgraph_update)
+
+    def stop(self):
+        if self.active:
+            self.profile.disable()
+            self.active = False
+        if self.depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(self.depsgraph_update)
+
+    # Time spent inside bpy.ops.render.render is taken from the renderer's phase timings
+    def begin_part(self, render_time):
+        if self.parts_profiled < self.part_limit:
+            self.render_time_at_part_start = render_time
+            self.active = True
+            self.profile.enable()
+
+    def end_part(self, render_time):
+        if self.active:
+            self.profile.disable()
+            self.active = False
+            self.parts_profiled += 1
+            self.render_time += render_time - self.render_time_at_part_start
+
+    # Write a .prof file and a readable summary of the top functions into the output directory
+    def write(self, output_directory):
+        base_path = os.path.join(output_directory, time.strftime("render_profile_%Y%m%d_%H%M%S"))
+        self.profile.dump_stats(base_path + ".prof")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+
+        with open(base_path + ".txt", "w", encoding="utf-8") as summary_file:
+            summary_file.write(f"Parts profiled: {self.parts_profiled}\n")
+            summary_file.write(f"Depsgraph updates: {self.depsgraph_updates}\n")
+            summary_file.write(f"Objects evaluated: {self.objects_evaluated}\n")
+            summary_file.write(f"Time in bpy.ops.render.render: {self.render_time:.3f}s\n\n")
+            summary_file.write(stream.getvalue())
+
+        return base_path + ".prof"
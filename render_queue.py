@@ -0,0 +1,176 @@
+import os
+import socket
+import time
+import bpy
+
+from .automated_parts_renderer import get_render_objects, last_run_summary
+from .scene_snapshot import SceneSnapshot
+from .task_queue import RenderQueue
+
+
+def get_queue_path(context):
+    return bpy.path.abspath(context.scene.automated_object_renderer.queue_file)
+
+
+def default_worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Datablocks that come along with an appended object, removed again after its task when nothing else uses them.
+# Ordered so that datablocks are removed before the ones they use.
+APPENDED_DATA_COLLECTIONS = ("meshes", "materials", "node_groups", "images")
+
+
+# Get the object of a task, appending it from its .blend library when it is not in the open file.
+# The snapshot removes the appended object and the datablocks that came with it when it is restored.
+def load_task_object(context, task, snapshot):
+    blend_file = task["blend_file"]
+    object_name = task["object_name"]
+
+    if bpy.data.filepath and os.path.exists(blend_file) and os.path.samefile(bpy.data.filepath, blend_file):
+        return bpy.data.objects.get(object_name)
+
+    existing_data = {name: set(getattr(bpy.data, name)) for name in APPENDED_DATA_COLLECTIONS}
+    with bpy.data.libraries.load(blend_file, link=False) as (data_from, data_to):
+        if object_name in data_from.objects:
+            data_to.objects = [object_name]
+
+    if not data_to.objects:
+        return None
+
+    obj = data_to.objects[0]
+
+    # An object of the same name in the open file makes Blender number the appended one, so the open file's
+    # object is renamed for the task and its images, manifest rows and SKU carry the task's name.
+    # The appended object is removed before the open file's object gets its name back.
+    if obj.name != object_name:
+        snapshot.set(bpy.data.objects[object_name], "name", object_name + ".queue")
+        obj.name = object_name
+    snapshot.on_restore(lambda: remove_task_object(obj, existing_data))
+
+    context.scene.collection.objects.link(obj)
+    return obj
+
+
+def remove_task_object(obj, existing_data):
+    bpy.data.objects.remove(obj)
+    for collection_name in APPENDED_DATA_COLLECTIONS:
+        datablocks = getattr(bpy.data, collection_name)
+        for datablock in list(datablocks):
+            if datablock not in existing_data[collection_name] and datablock.users == 0:
+                datablocks.remove(datablock)
+
+
+class RENDER_OT_enqueue_selected_objects(bpy.types.Operator):
+    bl_idname = "render.enqueue_selected_objects"
+    bl_label = "Add Selected Objects to Queue"
+    bl_description = "Add the selected objects to the shared render queue"
+
+    def execute(self, context):
+        if not bpy.data.filepath:
+            self.report({'ERROR'}, "Save the .blend file before adding objects to the queue")
+            return {'CANCELLED'}
+
+        queue_path = get_queue_path(context)
+        if not queue_path:
+            self.report({'ERROR'}, "No queue file set")
+            return {'CANCELLED'}
+
+        render_settings = context.scene.automated_object_renderer
+        render_objects = get_render_objects(context.selected_objects, render_settings.duplicate_filter)
+
+        queue = RenderQueue(queue_path)
+        try:
+            queue.enqueue(bpy.data.filepath, [obj.name for obj in render_objects])
+            pending = queue.status_counts().get('PENDING', 0)
+        finally:
+            queue.close()
+
+        self.report({'INFO'}, f"Queued {len(render_objects)} objects, {pending} pending in total")
+        return {'FINISHED'}
+
+
+# Drain the shared queue, rendering each task with the current scene's renderer settings
+class RENDER_OT_automated_parts_worker(bpy.types.Operator):
+    bl_idname = "render.automated_parts_worker"
+    bl_label = "Run Render Worker"
+    bl_description = "Render objects from the shared render queue until it is empty"
+
+    queue_file: bpy.props.StringProperty(name="Queue File", subtype='FILE_PATH', default="")
+    worker_name: bpy.props.StringProperty(name="Worker Name", default="")
+    max_tasks: bpy.props.IntProperty(name="Max Tasks", description="Stop after this many tasks (0 for no limit)", default=0, min=0)
+
+    def execute(self, context):
+        queue_path = bpy.path.abspath(self.queue_file) if self.queue_file else get_queue_path(context)
+        if not queue_path or not os.path.exists(queue_path):
+            self.report({'ERROR'}, "Queue file not found")
+            return {'CANCELLED'}
+
+        worker = self.worker_name or default_worker_name()
+
+        queue = RenderQueue(queue_path)
+        done_count = 0
+        try:
+            while self.max_tasks == 0 or done_count < self.max_tasks:
+                task = queue.claim(worker, bpy.data.filepath)
+                if task is None:
+                    break
+
+                start_time = time.perf_counter()
+                try:
+                    # Appended objects and renamed objects of the open file are restored after every task
+                    with SceneSnapshot() as task_snapshot:
+                        obj = load_task_object(context, task, task_snapshot)
+                        if obj is None:
+                            raise LookupError(f"Object {task['object_name']} not found in {task['blend_file']}")
+
+                        bpy.ops.object.select_all(action='DESELECT')
+                        obj.select_set(True)
+                        context.view_layer.objects.active = obj
+                        result = bpy.ops.render.automated_object_renderer()
+                        if 'FINISHED' not in result:
+                            raise RuntimeError("Render run was cancelled, see the worker's console")
+                except Exception as error:
+                    queue.fail(task["id"], str(error))
+                    print(f"Render worker {worker}: task {task['id']} failed: {error}")
+                    continue
+
+                duration = time.perf_counter() - start_time
+                queue.complete(task["id"], duration, last_run_summary.get("images", 0))
+                done_count += 1
+                print(f"Render worker {worker}: rendered {task['object_name']} in {duration:.2f}s")
+        finally:
+            queue.close()
+
+        self.report({'INFO'}, f"Render worker {worker} finished {done_count} tasks")
+        return {'FINISHED'}
+
+
+class RENDER_PT_automated_parts_render_queue(bpy.types.Panel):
+    bl_label = "Render Queue"
+    bl_idname = "RENDER_PT_automated_parts_render_queue"
+    bl_parent_id = "RENDER_PT_automated_object_renderer"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "render"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        render_settings = context.scene.automated_object_renderer
+
+        layout.prop(render_settings, "queue_file")
+        layout.operator(RENDER_OT_enqueue_selected_objects.bl_idname)
+        layout.operator(RENDER_OT_automated_parts_worker.bl_idname)
+
+
+def register():
+    bpy.utils.register_class(RENDER_OT_enqueue_selected_objects)
+    bpy.utils.register_class(RENDER_OT_automated_parts_worker)
+    bpy.utils.register_class(RENDER_PT_automated_parts_render_queue)
+
+
+def unregister():
+    bpy.utils.unregister_class(RENDER_OT_enqueue_selected_objects)
+    bpy.utils.unregister_class(RENDER_OT_automated_parts_worker)
+    bpy.utils.unregister_class(RENDER_PT_automated_parts_render_queue)
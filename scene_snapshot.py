@@ -0,0 +1,69 @@
+from mathutils import Color, Euler, Matrix, Quaternion, Vector
+
+
+# Records the original value of every scene setting a render run changes, and puts them back in
+# reverse order when the run ends or fails. Only the settings that were changed are restored, so
+# restoring costs the same however large the scene's world and compositor node trees are.
+class SceneSnapshot:
+    def __init__(self):
+        self.changes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.restore()
+        return False
+
+    # Set an attribute, remembering the value it had before. Datablocks like scene.world or
+    # scene.camera are swapped the same way, without touching the datablocks themselves.
+    def set(self, owner, attribute, value):
+        original = getattr(owner, attribute)
+        # Vectors and rotations are views of the owner's data, so the original is copied
+        if isinstance(original, (Color, Euler, Matrix, Quaternion, Vector)):
+            original = original.copy()
+        self.changes.append((owner, attribute, original))
+        setattr(owner, attribute, value)
+
+    # Call a function when the snapshot is restored, like removing a datablock the run created
+    def on_restore(self, function):
+        self.changes.append((None, function, None))
+
+    # Undo all changes, newest first. A failing change does not keep the others from being undone.
+    def restore(self):
+        errors = []
+        while self.changes:
+            owner, attribute, value = self.changes.pop()
+            try:
+                if owner is None:
+                    attribute()
+                else:
+                    setattr(owner, attribute, value)
+            except (AttributeError, ReferenceError, RuntimeError, TypeError, ValueError) as e:
+                errors.append(e)
+                print(f"Could not restore scene setting {attribute}: {e}")
+        return errors
+
+
+# Render through compositor nodes that build_nodes adds to the scene's node tree, returning their
+# Composite node. The scene's own compositor tree cannot be replaced, so its nodes are muted and our
+# Composite node is made the active one, which is the one Blender renders to. Restoring the
+# snapshot removes our nodes and unmutes the scene's nodes, leaving the user's compositor as it was.
+def use_render_compositor(snapshot, scene, build_nodes):
+    snapshot.set(scene, "use_nodes", True)
+    tree = scene.node_tree
+
+    scene_nodes = list(tree.nodes)
+    for node in scene_nodes:
+        if not node.mute:
+            snapshot.set(node, "mute", True)
+
+    composite_node = build_nodes(tree)
+    render_nodes = [node for node in tree.nodes if node not in scene_nodes]
+
+    def remove_render_nodes():
+        for node in render_nodes:
+            tree.nodes.remove(node)
+
+    snapshot.on_restore(remove_render_nodes)
+    snapshot.set(tree.nodes, "active", composite_node)
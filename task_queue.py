@@ -0,0 +1,88 @@
+import sqlite3
+import time
+
+
+# Tasks claimed longer ago than this are assumed to belong to a dead worker
+LEASE_TIMEOUT = 3600.0
+MAX_ATTEMPTS = 3
+
+
+# A render queue stored in a SQLite file on a directory shared by all render nodes
+class RenderQueue:
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "blend_file TEXT NOT NULL, "
+            "object_name TEXT NOT NULL, "
+            "status TEXT NOT NULL DEFAULT 'PENDING', "
+            "worker TEXT, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "claimed_at REAL, "
+            "finished_at REAL, "
+            "duration REAL, "
+            "image_count INTEGER, "
+            "error TEXT, "
+            "UNIQUE (blend_file, object_name))"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, blend_file)")
+
+    def close(self):
+        self.connection.close()
+
+    def enqueue(self, blend_file, object_names):
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            # Queuing a part again resets its task, except while a worker is rendering it
+            self.connection.executemany(
+                "INSERT INTO tasks (blend_file, object_name) VALUES (?, ?) "
+                "ON CONFLICT (blend_file, object_name) DO UPDATE SET status = 'PENDING', worker = NULL, attempts = 0, "
+                "claimed_at = NULL, finished_at = NULL, duration = NULL, image_count = NULL, error = NULL "
+                "WHERE status != 'RUNNING'",
+                [(blend_file, name) for name in object_names],
+            )
+
+    # Atomically take the next pending task, preferring parts of the already loaded .blend file
+    def claim(self, worker, preferred_blend_file=""):
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            # Expired tasks count as failed attempts, so that a task that crashes its worker is not retried forever
+            self.connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'PENDING' ELSE 'FAILED' END, worker = NULL, "
+                "error = 'Worker lease expired' WHERE status = 'RUNNING' AND claimed_at < ?",
+                (MAX_ATTEMPTS, time.time() - LEASE_TIMEOUT),
+            )
+            row = self.connection.execute(
+                "SELECT * FROM tasks WHERE status = 'PENDING' ORDER BY blend_file = ? DESC, id LIMIT 1",
+                (preferred_blend_file,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.connection.execute(
+                "UPDATE tasks SET status = 'RUNNING', worker = ?, attempts = attempts + 1, claimed_at = ? WHERE id = ?",
+                (worker, time.time(), row["id"]),
+            )
+
+        return dict(row)
+
+    def complete(self, task_id, duration, image_count):
+        self.connection.execute(
+            "UPDATE tasks SET status = 'DONE', finished_at = ?, duration = ?, image_count = ?, error = NULL WHERE id = ?",
+            (time.time(), duration, image_count, task_id),
+        )
+
+    # Failed tasks go back to the queue until they have been attempted MAX_ATTEMPTS times
+    def fail(self, task_id, error):
+        self.connection.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'PENDING' ELSE 'FAILED' END, "
+            "finished_at = ?, error = ? WHERE id = ?",
+            (MAX_ATTEMPTS, time.time(), error, task_id),
+        )
+
+    def status_counts(self):
+        rows = self.connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
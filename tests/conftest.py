@@ -0,0 +1,12 @@
+import os
+import sys
+import types
+
+
+# The add-on's __init__ registers it with Blender, so its modules are imported as a bare package instead.
+# Only modules that run without bpy are tested here.
+ADDON_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+package = types.ModuleType("addon")
+package.__path__ = [ADDON_DIRECTORY]
+sys.modules.setdefault("addon", package)
@@ -0,0 +1,28 @@
+import json
+import os
+
+from addon.framing_cache import FRAMING_CACHE_FILE_NAME, FramingCache
+
+
+def test_unreadable_cache_is_empty(tmp_path):
+    with open(os.path.join(tmp_path, FRAMING_CACHE_FILE_NAME), "w", encoding="utf-8") as cache_file:
+        cache_file.write('{"half written')
+
+    cache = FramingCache(str(tmp_path))
+    assert cache.framings == {}
+    assert cache.get("key") is None
+
+
+def test_save_merges_framings_of_other_renderers(tmp_path):
+    first = FramingCache(str(tmp_path))
+    second = FramingCache(str(tmp_path))
+    first.set("bolt", (0, 0, 5), (0, 0, 0))
+    first.save()
+    second.set("nut", (0, 5, 0), (1, 0, 0))
+    second.save()
+
+    with open(os.path.join(tmp_path, FRAMING_CACHE_FILE_NAME), encoding="utf-8") as cache_file:
+        framings = json.load(cache_file)
+    assert set(framings) == {"bolt", "nut"}
+    assert FramingCache(str(tmp_path)).get("bolt") == {"offset": [0, 0, 5], "rotation": [0, 0, 0]}
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
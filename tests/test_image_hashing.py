@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from addon.image_hashing import BKTree, find_duplicate_clusters, get_dhash, get_hamming_distance, get_phash
+
+
+def test_bk_tree_finds_the_same_hashes_as_a_linear_scan():
+    generator = random.Random(1)
+    hashes = [generator.getrandbits(64) for _ in range(300)]
+    # Near-duplicates of some hashes, a few bits apart
+    hashes += [value ^ (1 << generator.randrange(64)) ^ (1 << generator.randrange(64)) for value in hashes[:50]]
+
+    tree = BKTree()
+    for number, value in enumerate(hashes):
+        tree.add(value, number)
+
+    for query in hashes[::7]:
+        for max_distance in (0, 3, 10):
+            expected = {number for number, value in enumerate(hashes) if get_hamming_distance(query, value) <= max_distance}
+            assert set(tree.search(query, max_distance)) == expected
+
+
+def test_bk_tree_keeps_every_key_of_equal_hashes():
+    tree = BKTree()
+    tree.add(5, "a.png")
+    tree.add(5, "b.png")
+
+    assert sorted(tree.search(5, 0)) == ["a.png", "b.png"]
+
+
+def test_clusters_need_both_hashes_to_be_close():
+    image_hashes = {
+        "Bolt.png": {"phash": 0b1111, "dhash": 0b0000},
+        "Bolt_copy.png": {"phash": 0b1110, "dhash": 0b0001},
+        "Bolt_copy_2.png": {"phash": 0b1100, "dhash": 0b0011},
+        "Nut.png": {"phash": 0b1111, "dhash": 0xFFFF},
+        "Washer.png": {"phash": 0xFFFF0000, "dhash": 0xFFFF0000},
+    }
+
+    clusters = find_duplicate_clusters(image_hashes, max_distance=1)
+
+    assert clusters == [["Bolt.png", "Bolt_copy.png", "Bolt_copy_2.png"]]
+
+
+def test_hashes_of_similar_images_are_close():
+    generator = np.random.default_rng(2)
+    image = generator.random((32, 32))
+    brighter = np.clip(image + 0.05, 0, 1)
+    other = generator.random((32, 32))
+
+    assert get_hamming_distance(get_phash(image), get_phash(brighter)) <= 4
+    assert get_hamming_distance(get_phash(image), get_phash(other)) > 10
+    assert get_dhash(image[:8, :9]) == get_dhash(brighter[:8, :9])
@@ -0,0 +1,56 @@
+import os
+
+from addon.image_index import build_image_index, parse_image_name
+
+
+def test_parse_image_name():
+    assert parse_image_name("Part_A_12iso_3.png") == ("Part_A_12iso", 3)
+    assert parse_image_name("Part_A_12iso.png") == ("Part_A_12iso", None)
+    assert parse_image_name("Part_A_x.png") == ("Part_A_x", None)
+
+
+def test_images_are_grouped_by_object_and_sorted_by_step():
+    index = build_image_index("/images", [
+        "/images/Nutiso_10.png", "/images/Boltiso_2.png", "/images/Nutiso_9.png", "/images/Bo/Boltiso.png",
+    ])
+
+    assert index.objects == ["Boltiso", "Nutiso"]
+    assert index.get_images("Boltiso") == ["Boltiso.png", "Boltiso_2.png"]
+    assert index.get_images("Nutiso") == ["Nutiso_9.png", "Nutiso_10.png"]
+    assert index.get_path("Boltiso.png") == "/images/Bo/Boltiso.png"
+    assert len(index) == 4
+
+
+def test_neighbors_wrap_around():
+    index = build_image_index("/images", [f"/images/{name}" for name in ["A_0.png", "A_1.png", "B_0.png", "C_0.png"]])
+
+    assert index.get_neighbor_image("A_1.png", 1) == "A_0.png"
+    assert index.get_neighbor_image("A_0.png", -1) == "A_1.png"
+    assert index.get_neighbor_object("C", 1) == "A"
+    assert index.get_neighbor_object("A", -1) == "C"
+
+
+def test_adding_and_removing_objects_changes_the_version():
+    index = build_image_index("/images", ["/images/B_0.png"])
+    version = index.version
+
+    index.add("/images/B_1.png")
+    assert index.version == version
+
+    index.add("/images/A_0.png")
+    assert index.objects == ["A", "B"] and index.version > version
+    assert index.get_neighbor_object("A", 1) == "B"
+
+    version = index.version
+    index.remove("A_0.png")
+    assert index.objects == ["B"] and index.version > version
+    assert index.get_object_position("B") == 0
+
+
+def test_rename_moves_an_image_to_its_new_object():
+    index = build_image_index("/images", ["/images/B_0.png", "/images/B_1.png"])
+
+    index.rename("B_1.png", os.path.join("/images", "B.png"))
+
+    assert index.get_images("B") == ["B.png", "B_0.png"]
+    assert index.get_object_name("B_1.png") is None
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import zipfile
+
+from addon.import_package import PACKAGE_MANIFEST_NAME, ImportPackage
+
+
+def write_file(path, content):
+    with open(path, "wb") as output_file:
+        output_file.write(content)
+    return path
+
+
+def read_manifest(package_path):
+    with zipfile.ZipFile(package_path) as archive:
+        return json.loads(archive.read(PACKAGE_MANIFEST_NAME))
+
+
+def test_images_are_appended_once(tmp_path):
+    package_path = str(tmp_path / "package.zip")
+    bolt = write_file(str(tmp_path / "Bolt.png"), b"bolt")
+    nut = write_file(str(tmp_path / "Nut.png"), b"nut")
+
+    assert ImportPackage(package_path).add_images([bolt]) == 1
+    assert ImportPackage(package_path).add_images([bolt, nut]) == 1
+
+    with zipfile.ZipFile(package_path) as archive:
+        assert archive.namelist() == ["Bolt.png", "Nut.png"]
+        assert archive.getinfo("Bolt.png").compress_type == zipfile.ZIP_STORED
+        assert archive.read("Nut.png") == b"nut"
+
+
+def test_finalize_appends_the_workbook_and_a_manifest(tmp_path):
+    package_path = str(tmp_path / "package.zip")
+    bolt = write_file(str(tmp_path / "Bolt.png"), b"bolt")
+    workbook = write_file(str(tmp_path / "Media Import.xlsx"), b"workbook")
+    package = ImportPackage(package_path)
+    package.add_images([bolt])
+
+    assert package.finalize(workbook) == 2
+
+    manifest = read_manifest(package_path)
+    assert manifest["files"]["Bolt.png"] == {"sha256": hashlib.sha256(b"bolt").hexdigest(), "size": 4}
+    assert manifest["files"]["Media Import.xlsx"]["sha256"] == hashlib.sha256(b"workbook").hexdigest()
+    with zipfile.ZipFile(package_path) as archive:
+        assert archive.namelist() == ["Bolt.png", "Media Import.xlsx", PACKAGE_MANIFEST_NAME]
+
+
+def test_adding_to_a_finalized_package_reopens_it(tmp_path):
+    package_path = str(tmp_path / "package.zip")
+    bolt = write_file(str(tmp_path / "Bolt.png"), b"bolt")
+    nut = write_file(str(tmp_path / "Nut.png"), b"nut")
+    workbook = write_file(str(tmp_path / "Media Import.xlsx"), b"workbook")
+    package = ImportPackage(package_path)
+    package.add_images([bolt])
+    package.finalize(workbook)
+
+    package = ImportPackage(package_path)
+    package.add_images([nut])
+    with zipfile.ZipFile(package_path) as archive:
+        assert archive.namelist() == ["Bolt.png", "Nut.png"]
+
+    package.finalize(workbook)
+    assert sorted(read_manifest(package_path)["files"]) == ["Bolt.png", "Media Import.xlsx", "Nut.png"]
+
+
+def test_changed_images_are_replaced(tmp_path):
+    package_path = str(tmp_path / "package.zip")
+    bolt = write_file(str(tmp_path / "Bolt.png"), b"bolt")
+    ImportPackage(package_path).add_images([bolt])
+
+    write_file(bolt, b"new bolt")
+    os.utime(bolt, (1000000000, 1000000000))
+    ImportPackage(package_path).add_images([bolt])
+
+    with zipfile.ZipFile(package_path) as archive:
+        assert archive.namelist() == ["Bolt.png"]
+        assert archive.read("Bolt.png") == b"new bolt"
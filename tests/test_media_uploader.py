@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from addon.media_uploader import MediaUploader, UploadState, upload_files
+
+
+# Stand-in for the media endpoint: stores files by checksum and answers the first PUTs with 503
+class MediaServer(ThreadingHTTPServer):
+    def __init__(self, busy_responses=0):
+        super().__init__(("127.0.0.1", 0), MediaRequestHandler)
+        self.files = {}
+        self.file_names = {}
+        self.busy_responses = busy_responses
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api"
+
+
+class MediaRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def get_checksum(self):
+        assert self.path.startswith("/api/media/")
+        return self.path[len("/api/media/"):]
+
+    def respond(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+        self.respond(200 if self.get_checksum() in self.server.files else 404)
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            if self.server.busy_responses:
+                self.server.busy_responses -= 1
+                self.respond(503)
+                return
+            self.server.files[self.get_checksum()] = body
+            self.server.file_names[self.get_checksum()] = self.headers["X-File-Name"]
+        self.respond(201)
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def start(busy_responses=0):
+        media_server = MediaServer(busy_responses)
+        threading.Thread(target=media_server.serve_forever, daemon=True).start()
+        servers.append(media_server)
+        return media_server
+
+    yield start
+    for media_server in servers:
+        media_server.shutdown()
+        media_server.server_close()
+
+
+def write_images(directory, count):
+    files = []
+    for number in range(count):
+        path = os.path.join(directory, f"Part_{number}iso_0.png")
+        with open(path, "wb") as image_file:
+            image_file.write(os.urandom(1000 + number))
+        with open(path, "rb") as image_file:
+            files.append((path, hashlib.sha256(image_file.read()).hexdigest()))
+    return files
+
+
+def test_uploads_files_by_checksum_over_reused_connections(server, tmp_path):
+    media_server = server()
+    files = write_images(str(tmp_path), 20)
+
+    summary = upload_files(MediaUploader(media_server.url, token="", concurrency=4), files)
+
+    assert summary["uploaded"] == 20 and summary["failed"] == 0
+    assert summary["bytes"] == sum(os.path.getsize(path) for path, checksum in files)
+    for path, checksum in files:
+        with open(path, "rb") as image_file:
+            assert media_server.files[checksum] == image_file.read()
+        assert media_server.file_names[checksum] == os.path.basename(path)
+    assert len(media_server.connections) <= 4
+
+
+def test_skips_files_the_server_has(server, tmp_path):
+    media_server = server()
+    files = write_images(str(tmp_path), 3)
+    upload_files(MediaUploader(media_server.url, token=""), files[:1])
+
+    summary = upload_files(MediaUploader(media_server.url, token=""), files)
+
+    assert summary["uploaded"] == 2 and summary["skipped"] == 1
+
+
+def test_computes_missing_checksums(server, tmp_path):
+    media_server = server()
+    files = write_images(str(tmp_path), 2)
+
+    upload_files(MediaUploader(media_server.url, token=""), [(path, None) for path, checksum in files])
+
+    assert set(media_server.files) == {checksum for path, checksum in files}
+
+
+def test_retries_busy_responses(server, tmp_path):
+    media_server = server(busy_responses=2)
+    files = write_images(str(tmp_path), 1)
+
+    summary = upload_files(MediaUploader(media_server.url, token="", backoff=0.01), files)
+
+    assert summary["uploaded"] == 1 and summary["failed"] == 0
+
+
+def test_reports_files_that_keep_failing(server, tmp_path):
+    media_server = server(busy_responses=100)
+    files = write_images(str(tmp_path), 1)
+
+    summary = upload_files(MediaUploader(media_server.url, token="", max_attempts=2, backoff=0.01), files)
+
+    assert summary["failed"] == 1 and "HTTP 503" in summary["errors"][0]
+
+
+def test_upload_state_resumes_an_interrupted_upload(server, tmp_path):
+    media_server = server()
+    files = write_images(str(tmp_path), 3)
+    upload_files(MediaUploader(media_server.url, token=""), files[:2], UploadState(str(tmp_path)))
+    media_server.files.clear()
+
+    summary = upload_files(MediaUploader(media_server.url, token=""), files, UploadState(str(tmp_path)))
+
+    assert summary["skipped"] == 2 and summary["uploaded"] == 1
+    assert list(media_server.files) == [files[2][1]]
+
+
+def test_rejects_invalid_urls():
+    with pytest.raises(ValueError):
+        MediaUploader("ftp://example.com")
@@ -0,0 +1,85 @@
+import os
+import zipfile
+
+from addon.media_workbook import (TEMPLATE_PATH, get_manifest_product_images, get_picked_product_images, get_sku,
+                                  read_work_list, write_media_workbook)
+from addon.render_manifest import RenderManifest
+
+# openpyxl is bundled with the add-on and importable once media_workbook added it to the path
+from openpyxl import Workbook, load_workbook
+
+
+def test_get_sku():
+    assert get_sku("Part_Aiso") == ("Part_A", "iso")
+    assert get_sku("Part_Atop") == ("Part_A", "top")
+    assert get_sku("Part_A") == ("Part_A", "")
+    assert get_sku("iso") == ("iso", "")
+
+
+def test_picked_images_are_ordered_by_view():
+    picks = {"Boltside": "Boltside.png", "Boltiso": "Boltiso.png", "Nuttop": "Nuttop.png", "Washeriso": None}
+
+    product_images = list(get_picked_product_images(sorted(picks), picks.get))
+
+    assert product_images == [("Bolt", ["Boltiso.png", "Boltside.png"]), ("Nut", ["Nuttop.png"])]
+
+
+def test_manifest_images_use_the_first_step_of_each_view(tmp_path):
+    directory = str(tmp_path)
+    manifest = RenderManifest(directory)
+    for view in ("top", "iso"):
+        for step in (1, 0):
+            path = os.path.join(directory, f"Bolt{view}_{step}.png")
+            with open(path, "w") as image_file:
+                image_file.write(path)
+            manifest.add_image(path, "Bolt", view, step, "settings")
+
+    try:
+        assert list(get_manifest_product_images(manifest)) == [("Bolt", ["Boltiso_0.png", "Bolttop_0.png"])]
+    finally:
+        manifest.close()
+
+
+def test_workbook_round_trip(tmp_path):
+    output_path = str(tmp_path / "Media Import.xlsx")
+    products = [(f"SKU{number:04d}", [f"SKU{number:04d}iso.png", f"SKU{number:04d}side.png"]) for number in range(500)]
+
+    product_count = write_media_workbook(output_path, iter(products))
+
+    assert product_count == 500
+    assert read_work_list(output_path) == {sku: file_names[0] for sku, file_names in products}
+
+    workbook = load_workbook(output_path, read_only=True)
+    try:
+        images = list(workbook["Images"].iter_rows(min_row=2, values_only=True))
+        assert len(images) == 1000
+        assert images[1][:4] == ("SKU0000side.png", "SKU0000", None, "Product")
+        rows = list(workbook["ProductImages"].iter_rows(min_row=2, max_row=2, values_only=True))
+        assert rows[0][2:4] == ("SKU0000", "SKU0000iso.png")
+        assert rows[0][8] == "SKU0000side.png"
+    finally:
+        workbook.close()
+
+
+def test_other_template_parts_are_copied_unchanged(tmp_path):
+    output_path = str(tmp_path / "Media Import.xlsx")
+    write_media_workbook(output_path, [("SKU1", ["SKU1iso.png"])])
+
+    with zipfile.ZipFile(TEMPLATE_PATH) as template, zipfile.ZipFile(output_path) as output:
+        assert output.namelist() == template.namelist()
+        for name in ("xl/workbook.xml", "xl/styles.xml"):
+            assert output.read(name) == template.read(name)
+
+
+def test_work_list_falls_back_to_the_virtual_sku(tmp_path):
+    output_path = str(tmp_path / "Work List.xlsx")
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "ProductImages"
+    sheet.append(["InquirySKU", "VirtualSKU", "ProductSKU", "MainProductImage__File"])
+    sheet.append([None, "Kit1", None, None])
+    sheet.append([None, None, "Bolt", "Boltiso.png"])
+    sheet.append([None, None, None, None])
+    workbook.save(output_path)
+
+    assert read_work_list(output_path) == {"Kit1": None, "Bolt": "Boltiso.png"}
@@ -0,0 +1,99 @@
+import os
+
+from addon.pick_journal import PickJournal, get_pick_moves, is_omitted_path
+
+
+def write_images(directory, names):
+    paths = []
+    for name in names:
+        path = os.path.join(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as image_file:
+            image_file.write(name)
+        paths.append(path)
+    return paths
+
+
+def list_files(directory):
+    return sorted(os.path.relpath(os.path.join(root, name), directory)
+                  for root, directories, names in os.walk(directory) for name in names if name.endswith(".png"))
+
+
+def test_pick_moves_rename_the_picked_image_in_its_shard():
+    moves = get_pick_moves("Boltiso", os.path.join("Bo", "Boltiso_1.png"),
+                           [os.path.join("Bo", "Boltiso_0.png"), os.path.join("Bo", "Boltiso_1.png")])
+
+    assert moves == [
+        (os.path.join("Bo", "Boltiso_0.png"), os.path.join("Omitted", "Boltiso_0.png")),
+        (os.path.join("Bo", "Boltiso_1.png"), os.path.join("Bo", "Boltiso.png")),
+    ]
+    assert is_omitted_path(moves[0][1]) and not is_omitted_path(moves[1][1])
+
+
+def test_commit_and_undo_in_a_flat_folder(tmp_path):
+    directory = str(tmp_path)
+    paths = write_images(directory, ["Boltiso_0.png", "Boltiso_1.png", "Nutiso_0.png"])
+    journal = PickJournal(directory)
+    journal.record_pick("Boltiso", paths[1], paths[:2])
+
+    done, errors = journal.commit()
+
+    assert errors == [] and len(done) == 2
+    assert list_files(directory) == ["Boltiso.png", "Nutiso_0.png", os.path.join("Omitted", "Boltiso_0.png")]
+    assert journal.pending == {}
+
+    done, errors = journal.undo()
+
+    assert errors == [] and len(done) == 2
+    assert list_files(directory) == ["Boltiso_0.png", "Boltiso_1.png", "Nutiso_0.png"]
+    assert journal.get_pick("Boltiso") == "Boltiso_1.png"
+
+
+def test_commit_in_a_sharded_folder(tmp_path):
+    directory = str(tmp_path)
+    paths = write_images(directory, [os.path.join("Bo", f"Boltiso_{step}.png") for step in range(3)])
+    journal = PickJournal(directory)
+    journal.record_pick("Boltiso", paths[2], paths)
+
+    done, errors = journal.commit()
+
+    assert errors == [] and len(done) == 3
+    assert list_files(directory) == [os.path.join("Bo", "Boltiso.png"), os.path.join("Omitted", "Boltiso_0.png"),
+                                     os.path.join("Omitted", "Boltiso_1.png")]
+
+
+def test_journal_is_replayed(tmp_path):
+    directory = str(tmp_path)
+    paths = write_images(directory, ["Boltiso_0.png", "Boltiso_1.png", "Nutiso_0.png", "Nutiso_1.png"])
+    journal = PickJournal(directory)
+    journal.record_pick("Boltiso", paths[0], paths[:2])
+    journal.commit()
+    journal.record_pick("Nutiso", paths[3], paths[2:])
+    journal.record_pick("Washeriso", paths[3], paths[3:])
+    journal.cancel_pick("Washeriso")
+
+    replayed = PickJournal(directory)
+
+    assert replayed.pending == journal.pending
+    assert list(replayed.pending) == ["Nutiso"]
+    assert len(replayed.commits) == 1
+
+
+def test_failed_moves_keep_the_pick_pending_and_can_be_committed_again(tmp_path):
+    directory = str(tmp_path)
+    paths = write_images(directory, ["Boltiso_0.png", "Boltiso_1.png", "Nutiso_0.png"])
+    journal = PickJournal(directory)
+    journal.record_pick("Boltiso", paths[0], paths[:2])
+    journal.record_pick("Nutiso", paths[2], paths[2:])
+    os.remove(paths[1])
+
+    done, errors = journal.commit()
+
+    assert len(errors) == 1 and "Boltiso_1.png" in errors[0]
+    assert list(journal.pending) == ["Boltiso"]
+
+    write_images(directory, ["Boltiso_1.png"])
+    done, errors = journal.commit()
+
+    assert errors == []
+    assert list_files(directory) == ["Boltiso.png", "Nutiso.png", os.path.join("Omitted", "Boltiso_1.png")]
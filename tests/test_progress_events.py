@@ -0,0 +1,26 @@
+import json
+import os
+
+import pytest
+
+from addon.progress_events import NullEventStream, ProgressEventStream, open_event_stream
+
+
+@pytest.mark.parametrize("target", ["tcp://localhost", "tcp://localhost:port", "tcp://localhost:99999"])
+def test_malformed_targets_disable_events(target):
+    assert isinstance(open_event_stream(target, 1.0), NullEventStream)
+
+
+def test_image_events_are_buffered_until_the_interval(tmp_path):
+    path = os.path.join(tmp_path, "events", "run.jsonl")
+    stream = open_event_stream(path, 3600.0)
+    assert isinstance(stream, ProgressEventStream)
+
+    stream.emit("image_written", step=0)
+    assert os.path.getsize(path) == 0
+    stream.emit("part_started", object="Bolt")
+    stream.close()
+
+    with open(path, encoding="utf-8") as events_file:
+        events = [json.loads(line) for line in events_file]
+    assert [event["event"] for event in events] == ["image_written", "part_started"]
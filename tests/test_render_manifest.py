@@ -0,0 +1,45 @@
+import os
+
+from addon.render_manifest import RenderManifest, get_shard_name, open_existing_manifest
+
+
+def write_image(directory, relative_path):
+    path = os.path.join(directory, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as image_file:
+        image_file.write(relative_path)
+    return path
+
+
+def test_shard_names():
+    assert get_shard_name("Bolt M8", "FLAT", 2) == ""
+    assert get_shard_name("Bolt M8", "NAME_PREFIX", 6) == "Bolt_M"
+    assert len(get_shard_name("Bolt M8", "HASH", 3)) == 3
+
+
+def test_committed_rows_are_visible_to_other_writers(tmp_path):
+    directory = str(tmp_path)
+    first = RenderManifest(directory)
+    first.add_image(write_image(directory, os.path.join("Bo", "Boltiso_0.png")), "Bolt", "iso", 0, "settings")
+    first.commit()
+
+    # A second renderer sharing the output directory can write while the first one is still open
+    second = open_existing_manifest(directory)
+    second.add_image(write_image(directory, os.path.join("Nu", "Nutiso_0.png")), "Nut", "iso", 0, "settings")
+    second.close()
+
+    assert first.image_paths() == [os.path.join(directory, "Bo", "Boltiso_0.png"),
+                                   os.path.join(directory, "Nu", "Nutiso_0.png")]
+    first.close()
+    first.close()
+
+
+def test_moved_images_keep_their_rows(tmp_path):
+    directory = str(tmp_path)
+    manifest = RenderManifest(directory)
+    manifest.add_image(write_image(directory, os.path.join("Bo", "Boltiso_0.png")), "Bolt", "iso", 0, "settings")
+
+    manifest.move_image(os.path.join("Bo", "Boltiso_0.png"), os.path.join("Bo", "Boltiso.png"))
+
+    assert manifest.image_paths("Bolt") == [os.path.join(directory, "Bo", "Boltiso.png")]
+    manifest.close()
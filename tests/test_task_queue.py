@@ -0,0 +1,101 @@
+import os
+import threading
+
+from addon.task_queue import LEASE_TIMEOUT, MAX_ATTEMPTS, RenderQueue
+
+
+def open_queue(tmp_path):
+    return RenderQueue(os.path.join(tmp_path, "queue.sqlite"))
+
+
+def expire_lease(queue, task_id):
+    queue.connection.execute("UPDATE tasks SET claimed_at = claimed_at - ? WHERE id = ?", (LEASE_TIMEOUT + 1, task_id))
+
+
+def test_claims_prefer_the_loaded_file(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue("a.blend", ["Bolt"])
+    queue.enqueue("b.blend", ["Nut"])
+
+    assert queue.claim("worker", "b.blend")["object_name"] == "Nut"
+    assert queue.claim("worker", "b.blend")["object_name"] == "Bolt"
+    assert queue.claim("worker", "b.blend") is None
+    queue.close()
+
+
+def test_concurrent_workers_claim_every_task_once(tmp_path):
+    names = [f"Part{i}" for i in range(40)]
+    queue = open_queue(tmp_path)
+    queue.enqueue("parts.blend", names)
+    queue.close()
+
+    claimed = []
+
+    def work(worker):
+        worker_queue = open_queue(tmp_path)
+        while True:
+            task = worker_queue.claim(worker)
+            if task is None:
+                break
+            claimed.append(task["object_name"])
+            worker_queue.complete(task["id"], 0.0, 1)
+        worker_queue.close()
+
+    threads = [threading.Thread(target=work, args=(f"worker{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(names)
+    queue = open_queue(tmp_path)
+    assert queue.status_counts() == {"DONE": len(names)}
+    queue.close()
+
+
+def test_failed_tasks_are_retried_up_to_max_attempts(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue("parts.blend", ["Bolt"])
+
+    for attempt in range(MAX_ATTEMPTS):
+        task = queue.claim("worker")
+        assert task is not None
+        queue.fail(task["id"], "render failed")
+
+    assert queue.claim("worker") is None
+    assert queue.status_counts() == {"FAILED": 1}
+    queue.close()
+
+
+def test_expired_leases_count_as_attempts(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue("parts.blend", ["Bolt"])
+
+    for attempt in range(MAX_ATTEMPTS):
+        task = queue.claim("crashing worker")
+        assert task is not None
+        expire_lease(queue, task["id"])
+
+    assert queue.claim("worker") is None
+    row = queue.connection.execute("SELECT status, error FROM tasks").fetchone()
+    assert tuple(row) == ("FAILED", "Worker lease expired")
+    queue.close()
+
+
+def test_enqueue_keeps_running_tasks(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue("parts.blend", ["Bolt", "Nut"])
+    running = queue.claim("worker")
+    other = queue.claim("worker")
+    queue.fail(other["id"], "render failed")
+
+    # Queuing both parts again resets the failed one but leaves the running one to its worker
+    queue.enqueue("parts.blend", ["Bolt", "Nut"])
+    queue.complete(running["id"], 1.0, 4)
+
+    rows = {row["object_name"]: dict(row) for row in queue.connection.execute("SELECT * FROM tasks")}
+    assert rows[running["object_name"]]["status"] == "DONE"
+    assert rows[running["object_name"]]["id"] == running["id"]
+    assert rows[other["object_name"]]["status"] == "PENDING"
+    assert rows[other["object_name"]]["attempts"] == 0
+    queue.close()